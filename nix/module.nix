@@ -44,6 +44,7 @@ let
     shapely
     pyyaml
     orjson
+    urllib3
   ]);
 
   # ── Tileset config ───────────────────────────────────────────────────────
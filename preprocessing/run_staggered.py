@@ -11,7 +11,8 @@ Flow:
        d. Sleep `--gap-seconds` before the next region (optional).
 
 This spreads network and CPU load over time and keeps the live tile set
-incrementally up to date as each region finishes.
+incrementally up to date as each region finishes.  Without a gap, the next
+region's download (2a) overlaps the current region's conversion and tiling.
 """
 
 import argparse
@@ -48,6 +49,19 @@ def is_tile_fresh(tile_index: Path, pbf_path: Path, max_age_days: int) -> bool:
     return True
 
 
+def region_files(name: str, data_dir: Path, tiles_dir: Path) -> tuple[str, Path, Path, Path]:
+    """Return (raw_name, pbf_path, geojson_path, tile_index) for a region name."""
+    # Normalise: strip any trailing "-latest" the caller may have included
+    raw_name = name[: -len("-latest")] if name.endswith("-latest") else name
+    pbf_name = f"{raw_name}-latest"
+    return (
+        raw_name,
+        data_dir / f"{pbf_name}.osm.pbf",
+        data_dir / pbf_name / f"{pbf_name}.osm.geojson",
+        tiles_dir / "regions" / f"{raw_name}.tiles.json.gz",
+    )
+
+
 def run(script: Path, args: list[str], extra_env: dict | None = None) -> None:
     """Run a sibling preprocessing script, inheriting stdio."""
     env = {**os.environ, **(extra_env or {})}
@@ -221,71 +235,118 @@ def main() -> None:
     run(SCRIPTS_DIR / "step_1_download.py", land_args)
 
     # ── Per-region loop ───────────────────────────────────────────────────────
-    for i, region in enumerate(regions):
-        name: str = region["name"]
-        url: str  = region["url"]
-
-        # Normalise: strip any trailing "-latest" the caller may have included
-        raw_name = name[: -len("-latest")] if name.endswith("-latest") else name
-        pbf_name = f"{raw_name}-latest"
-
-        _log(f"Region {i + 1}/{len(regions)}: {pbf_name}")
-
-        pbf_path     = args.data_dir / f"{pbf_name}.osm.pbf"
-        geojson_path = args.data_dir / pbf_name / f"{pbf_name}.osm.geojson"
-        tile_index   = args.tiles_dir / "regions" / f"{raw_name}.tiles.json.gz"
-
-        # ── freshness check (skipped when explicitly adding a region) ─────────
-        if not args.add_region and is_tile_fresh(tile_index, pbf_path, args.max_tile_age):
-            age_days = (time.time() - tile_index.stat().st_mtime) / 86400
-            _log(f"  {pbf_name}: tiles are {age_days:.1f}d old and newer than PBF — skipping.")
-            continue
-
-        # ── a) Download PBF ───────────────────────────────────────────────────
-        run(SCRIPTS_DIR / "step_1_download.py", [
-            "--add-region", name, url,
+    def download_args(region: dict) -> list[str]:
+        return [
+            "--add-region", region["name"], region["url"],
             "--data-dir", str(args.data_dir),
             "--max-file-age", str(args.max_tile_age),
-        ])
-
-        # ── b) Convert PBF → GeoJSON ──────────────────────────────────────────
-        run(SCRIPTS_DIR / "step_2_convert_to_geojson.py", [
-            str(pbf_path),
-            "--data-dir", str(args.data_dir),
-            "-j", str(args.jobs),
-        ])
-
-        # ── c) Generate / update tiles ────────────────────────────────────────
-        # Use --update if the region already exists in regions.json (faster:
-        # only affected tiles are deleted and rewritten).  Fall back to --add
-        # on first run or if regions.json is missing.
-        regions_json = args.tiles_dir / "regions.json"
-        use_update = False
-        if regions_json.exists():
-            try:
-                with open(regions_json) as f:
-                    existing = json.load(f)
-                use_update = raw_name in existing.get("regions", {})
-            except Exception:
-                pass
-
-        if use_update:
-            step3_args = ["--update", raw_name]
-        else:
-            step3_args = ["--add", str(geojson_path)]
-
-        step3_args += [
-            "--data-dir",   str(args.data_dir),
-            "--output-dir", str(args.tiles_dir),
-            "-j",           str(args.jobs),
         ]
-        run(SCRIPTS_DIR / "step_3_generate_tiles.py", step3_args, extra_env=step3_env)
 
-        # ── d) Gap before next region ─────────────────────────────────────────
-        if args.gap_seconds > 0 and i < len(regions) - 1:
-            next_name = regions[i + 1]["name"]
-            _log(f"Sleeping {args.gap_seconds}s before {next_name}...")
-            time.sleep(args.gap_seconds)
+    def needs_build(region: dict) -> bool:
+        # Freshness check is skipped when explicitly adding a region
+        _, pbf_path, _, tile_index = region_files(region["name"], args.data_dir, args.tiles_dir)
+        return bool(args.add_region) or not is_tile_fresh(tile_index, pbf_path, args.max_tile_age)
+
+    def download_log(region: dict) -> Path:
+        raw_name = region_files(region["name"], args.data_dir, args.tiles_dir)[0]
+        return args.data_dir / f"{raw_name}-latest.download.log"
+
+    # Without a gap, the next region's PBF is downloaded by a child process while
+    # the current one converts and tiles (network-bound vs CPU-bound work).  Its
+    # output goes to a log that is replayed once the download is waited on.
+    prefetch = None  # (region index, Popen) of the in-flight background download
+
+    try:
+        for i, region in enumerate(regions):
+            name: str = region["name"]
+            raw_name, pbf_path, geojson_path, tile_index = region_files(
+                name, args.data_dir, args.tiles_dir
+            )
+            pbf_name = f"{raw_name}-latest"
+
+            _log(f"Region {i + 1}/{len(regions)}: {pbf_name}")
+
+            # ── freshness check ───────────────────────────────────────────────
+            if not needs_build(region):
+                age_days = (time.time() - tile_index.stat().st_mtime) / 86400
+                _log(f"  {pbf_name}: tiles are {age_days:.1f}d old and newer than PBF — skipping.")
+                continue
+
+            # ── a) Download PBF (or wait for last region's prefetch) ──────────
+            if prefetch is not None and prefetch[0] == i:
+                returncode = prefetch[1].wait()
+                log_path = download_log(region)
+                print(log_path.read_text(errors="replace"), end="", flush=True)
+                log_path.unlink()
+                if returncode != 0:
+                    sys.exit(returncode)
+            else:
+                run(SCRIPTS_DIR / "step_1_download.py", download_args(region))
+            prefetch = None
+
+            next_i = i + 1
+            if args.gap_seconds == 0:
+                while next_i < len(regions) and not needs_build(regions[next_i]):
+                    next_i += 1
+                if next_i < len(regions):
+                    _log(f"  Prefetching {regions[next_i]['name']} in the background")
+                    with open(download_log(regions[next_i]), "w") as log:
+                        prefetch = (
+                            next_i,
+                            subprocess.Popen(
+                                [sys.executable, str(SCRIPTS_DIR / "step_1_download.py"),
+                                 *download_args(regions[next_i])],
+                                stdout=log,
+                                stderr=subprocess.STDOUT,
+                            ),
+                        )
+
+            # ── b) Convert PBF → GeoJSON ──────────────────────────────────────
+            run(SCRIPTS_DIR / "step_2_convert_to_geojson.py", [
+                str(pbf_path),
+                "--data-dir", str(args.data_dir),
+                "-j", str(args.jobs),
+            ])
+
+            # ── c) Generate / update tiles ────────────────────────────────────
+            # Use --update if the region already exists in regions.json (faster:
+            # only affected tiles are deleted and rewritten).  Fall back to --add
+            # on first run or if regions.json is missing.
+            regions_json = args.tiles_dir / "regions.json"
+            use_update = False
+            if regions_json.exists():
+                try:
+                    with open(regions_json) as f:
+                        existing = json.load(f)
+                    use_update = raw_name in existing.get("regions", {})
+                except Exception:
+                    pass
+
+            if use_update:
+                step3_args = ["--update", raw_name]
+            else:
+                step3_args = ["--add", str(geojson_path)]
+
+            step3_args += [
+                "--data-dir",   str(args.data_dir),
+                "--output-dir", str(args.tiles_dir),
+                "-j",           str(args.jobs),
+            ]
+            run(SCRIPTS_DIR / "step_3_generate_tiles.py", step3_args, step3_env)
+
+            # ── d) Gap before next region ─────────────────────────────────────
+            if args.gap_seconds > 0 and i < len(regions) - 1:
+                next_name = regions[i + 1]["name"]
+                _log(f"Sleeping {args.gap_seconds}s before {next_name}...")
+                time.sleep(args.gap_seconds)
+    finally:
+        # Don't leave a download running if a step failed.  step_1 handles
+        # SIGTERM by truncating its .partial to a resumable prefix.
+        if prefetch is not None:
+            if prefetch[1].poll() is None:
+                prefetch[1].terminate()
+            prefetch[1].wait()
+            download_log(regions[prefetch[0]]).unlink(missing_ok=True)
 
     _log(f"Staggered build complete — {len(regions)} region(s) processed.")
 
@@ -11,24 +11,33 @@ All downloads are parallelized with progress bars.
 
 import argparse
 import json
+import os
 import re
 import shutil
+import signal
 import subprocess
 import sys
-import urllib.request
+import threading
+import time
 import zipfile
-from datetime import datetime, timedelta
-from functools import partial
-from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 try:
     from tqdm import tqdm
+    from tqdm.utils import CallbackIOWrapper
 except ImportError:
     print("Error: tqdm is required for progress bars")
     print("Install with: pip install tqdm")
     sys.exit(1)
 
+try:
+    import urllib3
+except ImportError:
+    print("Error: urllib3 is required for pooled HTTP downloads")
+    print("Install with: pip install urllib3")
+    sys.exit(1)
+
 from progress import is_interactive
 
 
@@ -40,6 +49,29 @@ def _log(msg: str) -> None:
         print(f"[step_1] {msg}", flush=True)
 
 
+# Shared connection pool: HEAD + GET for one file and consecutive downloads from the
+# same host reuse the TCP/TLS connection instead of re-handshaking per request.
+# Identity encoding so Content-Length/Range offsets match the bytes written to disk.
+_POOL = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=16,
+    retries=urllib3.Retry(total=5, backoff_factor=1),
+    headers={"Accept-Encoding": "identity"},
+)
+_TIMEOUT = urllib3.Timeout(connect=10, read=300)
+_CHUNK_SIZE = 1024 * 1024  # 1MB
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB, single-stream copy via shutil.copyfileobj
+
+# Fresh downloads of large files are split into parallel range requests; a single
+# TCP stream from geofabrik stays well below the available bandwidth.
+_SEGMENTS = 4
+_SEGMENTED_MIN_SIZE = 64 * 1024 * 1024  # 64MB
+
+# Set on SIGTERM (run_staggered terminates a prefetch when the build fails) so
+# running downloads stop after the current chunk and keep a resumable prefix.
+_STOP = threading.Event()
+
+
 # Land polygon sources (pre-computed land polygons for accurate coastline backgrounds)
 LAND_POLYGON_SOURCES = {
     "global": "https://osmdata.openstreetmap.de/download/land-polygons-split-4326.zip"
@@ -70,26 +102,185 @@ OSM_SOURCES = {
 }
 
 
-def check_file_age(file_path, max_age_days=30):
-    """Check if file exists and is newer than max_age_days."""
-    if not file_path.exists():
+def stat_if_exists(file_path):
+    """Return file_path.stat(), or None if the file does not exist."""
+    try:
+        return file_path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def check_file_age(file_stat, max_age_days=30, now=None):
+    """Check if a stat result exists and is newer than max_age_days."""
+    if file_stat is None:
         return False
-    file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-    age = datetime.now() - file_time
-    return age < timedelta(days=max_age_days)
+    if now is None:
+        now = time.time()
+    return now - file_stat.st_mtime < max_age_days * 86400
 
 
-def format_file_age(file_path):
+def format_file_age(file_stat, now=None):
     """Format file age as human-readable string."""
-    age = datetime.now() - datetime.fromtimestamp(file_path.stat().st_mtime)
-    total_seconds = int(age.total_seconds())
+    if now is None:
+        now = time.time()
+    total_seconds = int(now - file_stat.st_mtime)
     if total_seconds < 60:
         return f"{total_seconds}s old"
     if total_seconds < 3600:
         return f"{total_seconds // 60}m old"
-    if age.days < 1:
+    if total_seconds < 86400:
         return f"{total_seconds // 3600}h old"
-    return f"{age.days}d old"
+    return f"{total_seconds // 86400}d old"
+
+
+def _drop_page_cache(file_path):
+    """Ask the kernel to evict a just-written file from the page cache.
+
+    A multi-GB PBF is read back once by osmium, so keeping it cached only pushes
+    out more useful pages. Dirty pages are not dropped, hence the fdatasync.
+    No-op where posix_fadvise is unavailable (macOS, Windows).
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _write_partial_meta(meta_file, etag, last_modified, url, total_size):
+    """Save the validators a later run needs to resume a .partial download.
+
+    Only written for a .partial that holds a contiguous prefix of the file,
+    hence "Mode: sequential"; resume trusts the partial's size only then.
+    """
+    with open(meta_file, "w") as f:
+        f.write("Mode: sequential\n")
+        if etag:
+            f.write(f"ETag: {etag}\n")
+        if last_modified:
+            f.write(f"Last-Modified: {last_modified}\n")
+        f.write(f"URL: {url}\n")
+        f.write(f"Total-Size: {total_size}\n")
+
+
+def _download_segmented(url, temp_file, meta_file, total_size, etag, last_modified, desc):
+    """Download a file as parallel byte ranges written in place with os.pwrite.
+
+    Returns False (and removes temp_file) if the server answers a range request
+    with a full 200 response, so the caller can fall back to a single stream.
+    On error, temp_file is truncated to the prefix that was fully written and
+    only then gets its .partial.meta, so the single-stream If-Range resume can
+    pick up from there.  A run killed before that leaves no meta, and the
+    sparse file is discarded on the next run.
+    """
+    segment_size = -(-total_size // _SEGMENTS)
+    ranges = [
+        (start, min(start + segment_size, total_size) - 1)
+        for start in range(0, total_size, segment_size)
+    ]
+    # Next byte to write per segment; each is only advanced by its own thread
+    offsets = [start for start, _ in ranges]
+    validator = etag or last_modified
+    # Set when any segment fails, so its siblings stop instead of finishing
+    failed = threading.Event()
+
+    lock = threading.Lock()
+    # Without a bar (non-interactive), log every 20% of the shared byte count
+    report_step = total_size // 5 if not is_interactive() else 0
+    next_report = report_step or -1
+    downloaded = 0
+
+    def progress(n, pbar):
+        nonlocal downloaded, next_report
+        with lock:
+            pbar.update(n)
+            downloaded += n
+            if downloaded >= next_report > 0:
+                _log(f"{desc}: {downloaded * 100 // total_size}%")
+                next_report = (downloaded // report_step + 1) * report_step
+
+    def fetch(index, fd, pbar):
+        start, end = ranges[index]
+        headers = {"Range": f"bytes={start}-{end}"}
+        if validator:
+            # Server sends the full (new) file instead of a range if it changed
+            headers["If-Range"] = validator
+        response = _POOL.request(
+            "GET", url, headers=headers, preload_content=False, timeout=_TIMEOUT
+        )
+        try:
+            if response.status == 200:
+                # The body is the whole (changed) file: close rather than drain it
+                # so the connection isn't handed back to the pool mid-response.
+                response.close()
+                return False
+            if response.status != 206:
+                raise Exception(f"HTTP {response.status} for {url}")
+            for chunk in response.stream(_CHUNK_SIZE, decode_content=False):
+                if _STOP.is_set():
+                    raise Exception(f"Download of {url} interrupted")
+                if failed.is_set():
+                    response.close()
+                    return None
+                os.pwrite(fd, chunk, offsets[index])
+                offsets[index] += len(chunk)
+                progress(len(chunk), pbar)
+            if offsets[index] != end + 1:
+                raise Exception(
+                    f"Download incomplete: range {start}-{end} ended at {offsets[index]}"
+                )
+            return True
+        except BaseException:
+            failed.set()
+            raise
+        finally:
+            response.release_conn()
+
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        with tqdm(
+            total=total_size,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            desc=desc,
+            leave=False,
+            disable=not is_interactive(),
+        ) as pbar:
+            executor = ThreadPoolExecutor(max_workers=len(ranges))
+            try:
+                futures = [
+                    executor.submit(fetch, index, fd, pbar) for index in range(len(ranges))
+                ]
+                results = [future.result() for future in futures]
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                executor.shutdown()
+    except BaseException:
+        # Keep the leading segments that completed in order; the rest is sparse
+        complete = 0
+        for (_, end), offset in zip(ranges, offsets):
+            complete = offset
+            if offset != end + 1:
+                break
+        os.ftruncate(fd, complete)
+        os.close(fd)
+        if complete:
+            _write_partial_meta(meta_file, etag, last_modified, url, total_size)
+        else:
+            temp_file.unlink()
+        raise
+    os.close(fd)
+
+    if not all(results):
+        temp_file.unlink()
+        return False
+    return True
 
 
 def download_with_progress(url, output_path, desc):
@@ -101,6 +292,8 @@ def download_with_progress(url, output_path, desc):
     resume_pos = 0
     saved_etag = None
     saved_last_modified = None
+    saved_total_size = 0
+    saved_mode = None
 
     if temp_file.exists() and meta_file.exists():
         resume_pos = temp_file.stat().st_size
@@ -113,8 +306,19 @@ def download_with_progress(url, output_path, desc):
                         saved_etag = value.strip()
                     elif key == "Last-Modified":
                         saved_last_modified = value.strip()
+                    elif key == "Total-Size":
+                        saved_total_size = int(value.strip())
+                    elif key == "Mode":
+                        saved_mode = value.strip()
         except Exception:
             pass  # If metadata is corrupted, we'll start fresh
+        if saved_mode != "sequential":
+            # Size says nothing about a sparse, segment-written file
+            if is_interactive():
+                print("  → Found partial download of unknown layout, starting fresh")
+            temp_file.unlink()
+            meta_file.unlink()
+            resume_pos = 0
     elif temp_file.exists():
         # Partial file exists but no metadata - can't safely resume
         if is_interactive():
@@ -122,57 +326,81 @@ def download_with_progress(url, output_path, desc):
         temp_file.unlink()
 
     try:
-        # First, do a HEAD request to check ETag/Last-Modified
-        head_req = urllib.request.Request(url, method="HEAD")
         current_etag = None
         current_last_modified = None
-        try:
-            with urllib.request.urlopen(head_req) as head_response:
+        accepts_ranges = False
+        content_length = 0
+        if resume_pos == 0:
+            # HEAD tells us whether a fresh download can be split into ranges.
+            # Server may not support HEAD; in that case proceed with GET
+            head_response = _POOL.request("HEAD", url, timeout=_TIMEOUT)
+            if head_response.status < 400:
                 current_etag = head_response.headers.get("ETag")
                 current_last_modified = head_response.headers.get("Last-Modified")
-
-                # Validate if file hasn't changed
-                if resume_pos > 0:
-                    if current_etag and saved_etag and current_etag != saved_etag:
-                        if is_interactive():
-                            print("  → Remote file changed (ETag mismatch), starting fresh")
-                        resume_pos = 0
-                        temp_file.unlink()
-                        meta_file.unlink()
-                    elif (
-                        current_last_modified
-                        and saved_last_modified
-                        and current_last_modified != saved_last_modified
-                    ):
-                        if is_interactive():
-                            print(
-                                "  → Remote file changed (Last-Modified mismatch), starting fresh"
-                            )
-                        resume_pos = 0
-                        temp_file.unlink()
-                        meta_file.unlink()
-                    elif is_interactive():
-                        print(f"  → Resuming from {resume_pos / (1024 * 1024):.1f} MB")
-        except urllib.error.HTTPError:
-            # Server doesn't support HEAD, proceed with GET
-            pass
+                accepts_ranges = head_response.headers.get("Accept-Ranges") == "bytes"
+                content_length = int(head_response.headers.get("Content-Length", 0))
+
+        # Fresh download of a large file: fetch it as parallel ranges
+        if (
+            resume_pos == 0
+            and accepts_ranges
+            and content_length >= _SEGMENTED_MIN_SIZE
+            and hasattr(os, "pwrite")
+        ):
+            if _download_segmented(
+                url, temp_file, meta_file, content_length,
+                current_etag, current_last_modified, desc,
+            ):
+                temp_file.rename(output_path)
+                if meta_file.exists():
+                    meta_file.unlink()
+                _drop_page_cache(output_path)
+                return True
+            if is_interactive():
+                print("  → Server ignored range request, downloading as single stream")
 
         # Create request with Range header for resume support
-        req = urllib.request.Request(url)
+        headers = {}
         if resume_pos > 0:
-            req.add_header("Range", f"bytes={resume_pos}-")
-
-        with urllib.request.urlopen(req) as response:
-            # Get ETag and Last-Modified from GET response if HEAD failed
+            headers["Range"] = f"bytes={resume_pos}-"
+            # Validate and resume in one round trip: the server only honours the
+            # range if the file is unchanged, otherwise it sends the new file.
+            saved_validator = saved_etag or saved_last_modified
+            if saved_validator:
+                headers["If-Range"] = saved_validator
+            if is_interactive():
+                print(f"  → Resuming from {resume_pos / (1024 * 1024):.1f} MB")
+
+        response = _POOL.request(
+            "GET", url, headers=headers, preload_content=False, timeout=_TIMEOUT
+        )
+        try:
+            if response.status == 416 and resume_pos > 0:
+                # Range starts at EOF: the previous run fetched every byte but was
+                # interrupted before the rename (safe to trust: the partial was
+                # written sequentially, see above). Anything else is stale.
+                if resume_pos == saved_total_size:
+                    temp_file.rename(output_path)
+                    meta_file.unlink()
+                    _drop_page_cache(output_path)
+                    return True
+                temp_file.unlink()
+                meta_file.unlink()
+                raise Exception(f"Partial download no longer matches {url}, discarded")
+            if response.status >= 400:
+                raise Exception(f"HTTP {response.status} for {url}")
+
+            # Get ETag and Last-Modified from GET response if HEAD failed or was skipped
             if current_etag is None:
                 current_etag = response.headers.get("ETag")
             if current_last_modified is None:
                 current_last_modified = response.headers.get("Last-Modified")
 
-            # Check if server supports ranges
+            # Full response to a range request: remote file changed (If-Range
+            # failed) or the server doesn't support ranges
             if resume_pos > 0 and response.status != 206:
                 if is_interactive():
-                    print("  → Server doesn't support resume, starting from scratch")
+                    print("  → Remote file changed or resume unsupported, starting from scratch")
                 resume_pos = 0
                 if temp_file.exists():
                     temp_file.unlink()
@@ -193,13 +421,9 @@ def download_with_progress(url, output_path, desc):
                 total_size = int(response.headers.get("Content-Length", 0))
 
             # Save metadata for future resume attempts
-            with open(meta_file, "w") as f:
-                if current_etag:
-                    f.write(f"ETag: {current_etag}\n")
-                if current_last_modified:
-                    f.write(f"Last-Modified: {current_last_modified}\n")
-                f.write(f"URL: {url}\n")
-                f.write(f"Total-Size: {total_size}\n")
+            _write_partial_meta(
+                meta_file, current_etag, current_last_modified, url, total_size
+            )
 
             # Open file in append mode if resuming, write mode otherwise
             mode = "ab" if resume_pos > 0 else "wb"
@@ -212,13 +436,34 @@ def download_with_progress(url, output_path, desc):
                     unit_divisor=1024,
                     desc=desc,
                     leave=False,
+                    disable=not is_interactive(),
                 ) as pbar:
-                    while True:
-                        chunk = response.read(1024 * 1024)  # 1MB chunks
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        pbar.update(len(chunk))
+                    # Without a bar (non-interactive), log every 20% instead; the
+                    # threshold is precomputed so the loop only does one compare.
+                    report_step = total_size // 5 if pbar.disable and total_size > 0 else 0
+                    next_report = (resume_pos // report_step + 1) * report_step if report_step else -1
+                    downloaded = resume_pos
+
+                    def progress(n):
+                        nonlocal downloaded, next_report
+                        if _STOP.is_set():
+                            raise Exception(f"Download of {url} interrupted")
+                        pbar.update(n)
+                        downloaded += n
+                        if downloaded >= next_report > 0:
+                            _log(f"{desc}: {downloaded * 100 // total_size}%")
+                            next_report = (downloaded // report_step + 1) * report_step
+
+                    # Copy in 4MB blocks: far fewer read/write calls and progress
+                    # callbacks than one per 1MB chunk from response.stream().
+                    response.decode_content = False
+                    shutil.copyfileobj(
+                        response,
+                        CallbackIOWrapper(progress, f, "write"),
+                        _COPY_BUFFER_SIZE,
+                    )
+        finally:
+            response.release_conn()
 
         # Verify file size matches expected
         actual_size = temp_file.stat().st_size
@@ -229,10 +474,12 @@ def download_with_progress(url, output_path, desc):
         temp_file.rename(output_path)
         if meta_file.exists():
             meta_file.unlink()
+        _drop_page_cache(output_path)
         return True
     except Exception as e:
         # Keep partial file and metadata for resume
-        print("  → Partial download saved for resume")
+        if temp_file.exists():
+            print("  → Partial download saved for resume")
         raise e
 
 
@@ -242,13 +489,15 @@ def download_osm_file(args, max_age_days=30):
     pbf_file = data_dir / f"{name}-latest.osm.pbf"
 
     # Check if already up-to-date
-    if pbf_file.exists() and check_file_age(pbf_file, max_age_days=max_age_days):
-        size_mb = pbf_file.stat().st_size / (1024 * 1024)
+    file_stat = stat_if_exists(pbf_file)
+    now = time.time()
+    if check_file_age(file_stat, max_age_days=max_age_days, now=now):
+        size_mb = file_stat.st_size / (1024 * 1024)
         return {
             "name": name,
             "status": "cached",
             "size_mb": size_mb,
-            "age": format_file_age(pbf_file),
+            "age": format_file_age(file_stat, now=now),
         }
 
     try:
@@ -265,13 +514,15 @@ def download_and_convert_land_polygons(args, max_age_days=30):
     output_file = data_dir / f"{name}-land-polygons.geojson"
 
     # Check if already up-to-date
-    if output_file.exists() and check_file_age(output_file, max_age_days=max_age_days):
-        size_mb = output_file.stat().st_size / (1024 * 1024)
+    file_stat = stat_if_exists(output_file)
+    now = time.time()
+    if check_file_age(file_stat, max_age_days=max_age_days, now=now):
+        size_mb = file_stat.st_size / (1024 * 1024)
         return {
             "name": name,
             "status": "cached",
             "size_mb": size_mb,
-            "age": format_file_age(output_file),
+            "age": format_file_age(file_stat, now=now),
         }
 
     # Check for ogr2ogr
@@ -332,6 +583,12 @@ def download_and_convert_land_polygons(args, max_age_days=30):
         return {"name": name, "status": "failed", "error": str(e)}
 
 
+def _stop_on_sigterm(signum, frame):
+    """Exit normally on SIGTERM so in-flight downloads clean up their .partial."""
+    _STOP.set()
+    raise SystemExit(128 + signum)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download OSM data files and land polygons",
@@ -389,6 +646,8 @@ def main():
     )
 
     args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
     args.data_dir.mkdir(parents=True, exist_ok=True)
 
     # --add-region: download just one region, skip land polygons
@@ -471,10 +730,16 @@ def main():
     _log(f"Downloading OSM files ({len(active_sources)} sources)...")
     osm_args = [(name, url, args.data_dir) for name, url in active_sources.items()]
 
-    with Pool(args.jobs) as pool:
+    # Downloads are pure network I/O (socket reads release the GIL), so threads give
+    # the same throughput as processes and let workers share the _POOL connections.
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [
+            executor.submit(download_osm_file, osm_arg, max_age_days=args.max_file_age)
+            for osm_arg in osm_args
+        ]
         osm_results = list(
             tqdm(
-                pool.imap_unordered(partial(download_osm_file, max_age_days=args.max_file_age), osm_args),
+                (future.result() for future in as_completed(futures)),
                 total=len(osm_args),
                 desc="OSM files",
                 unit="file",
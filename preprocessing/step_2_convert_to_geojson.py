@@ -2,11 +2,15 @@
 """
 Step 2: Convert OSM PBF files to GeoJSON format.
 
-This script uses osmium to convert PBF files to GeoJSON.
+This script uses osmium to convert PBF files to GeoJSON. The output is
+newline-delimited (GeoJSONSeq, one Feature per line) so step 3 can parse each
+feature with a plain JSON loads instead of a streaming parser.
 Conversion can be parallelized across multiple files.
 """
 
 import argparse
+import hashlib
+import os
 import shutil
 import subprocess
 import sys
@@ -22,6 +26,9 @@ except ImportError:
 
 from progress import is_interactive
 
+# Resolved once at import; Pool workers inherit it instead of searching PATH per file.
+_OSMIUM = shutil.which("osmium")
+
 
 def _log(msg: str) -> None:
     if is_interactive():
@@ -40,6 +47,27 @@ def get_work_dir(pbf_path):
     return pbf_path.parent / folder_name
 
 
+_FINGERPRINT_SAMPLE = 64 * 1024
+
+
+def pbf_fingerprint(pbf_path, size):
+    """Cheap content fingerprint: BLAKE2b of the first/last 64 KB plus the size.
+
+    The PBF header block (with Geofabrik's replication timestamp) sits in the
+    first bytes, so a re-download of identical data matches while a new extract
+    does not - unlike mtime, which changes on every download or `touch`.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(pbf_path, "rb") as f:
+        h.update(f.read(_FINGERPRINT_SAMPLE))
+        if size > _FINGERPRINT_SAMPLE:
+            # Tail without overlapping the head, so files under 128 KB are hashed whole
+            f.seek(max(_FINGERPRINT_SAMPLE, size - _FINGERPRINT_SAMPLE))
+            h.update(f.read())
+    h.update(size.to_bytes(8, "little"))
+    return h.hexdigest()
+
+
 def convert_pbf_to_geojson(args):
     """Convert a single PBF file to GeoJSON."""
     pbf_file, config_file = args
@@ -50,12 +78,25 @@ def convert_pbf_to_geojson(args):
     work_dir.mkdir(exist_ok=True)
     geojson_path = work_dir / f"{pbf_path.stem}.geojson"
 
+    fingerprint_path = work_dir / f"{pbf_path.stem}.pbf.fingerprint"
+
     # Check if GeoJSON exists and is newer than PBF (skip conversion)
-    if geojson_path.exists():
-        pbf_mtime = pbf_path.stat().st_mtime
-        geojson_mtime = geojson_path.stat().st_mtime
-        if geojson_mtime > pbf_mtime:
-            size_mb = geojson_path.stat().st_size / (1024 * 1024)
+    try:
+        geojson_stat = geojson_path.stat()
+    except FileNotFoundError:
+        geojson_stat = None
+    pbf_stat = pbf_path.stat()
+    fingerprint = None
+    if geojson_stat is not None:
+        cached = geojson_stat.st_mtime > pbf_stat.st_mtime
+        if not cached and fingerprint_path.exists():
+            # PBF is newer but may hold the same data (re-download, touch, rsync)
+            fingerprint = pbf_fingerprint(pbf_path, pbf_stat.st_size)
+            if fingerprint_path.read_text().strip() == fingerprint:
+                os.utime(geojson_path)  # keep later mtime checks consistent
+                cached = True
+        if cached:
+            size_mb = geojson_stat.st_size / (1024 * 1024)
             return {
                 "name": pbf_path.name,
                 "status": "cached",
@@ -64,23 +105,28 @@ def convert_pbf_to_geojson(args):
             }
 
     # Check if osmium is available
-    if not shutil.which("osmium"):
+    if _OSMIUM is None:
         return {"name": pbf_path.name, "status": "failed", "error": "osmium not found"}
 
     try:
         cmd = [
-            "osmium",
+            _OSMIUM,
             "export",
             str(pbf_path),
             "-o",
             str(geojson_path),
             "--overwrite",
+            "-f",
+            "geojsonseq",
         ]
 
         if config_file and Path(config_file).exists():
             cmd.extend(["--config", str(config_file)])
 
         subprocess.run(cmd, check=True, capture_output=True)
+        if fingerprint is None:
+            fingerprint = pbf_fingerprint(pbf_path, pbf_stat.st_size)
+        fingerprint_path.write_text(fingerprint + "\n")
 
         size_mb = geojson_path.stat().st_size / (1024 * 1024)
         return {
@@ -7,8 +7,7 @@ and detailed progress reporting.
 """
 
 import argparse
-import copy
-import decimal
+import functools
 import gzip
 import json
 import math
@@ -19,7 +18,7 @@ import sys
 import tempfile
 import time
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from multiprocessing import Pool
 from pathlib import Path
 
@@ -47,6 +46,14 @@ except ImportError:
     print("Install with: pip install ijson")
     sys.exit(1)
 
+# Pin the yajl2_c backend explicitly. ijson silently falls back to its
+# pure-Python parser when the C extension is unavailable, which makes Pass 1
+# several times slower on large extracts; main() warns when that happens.
+try:
+    ijson = ijson.get_backend("yajl2_c")
+except ImportError:
+    pass
+
 try:
     import yaml
 except ImportError:
@@ -61,12 +68,33 @@ except ImportError:
     print("Install with: pip install orjson")
     sys.exit(1)
 
+try:
+    import shapely
+    from shapely.geometry import MultiLineString, box, mapping, shape
+except ImportError:
+    print("Error: shapely is required for geometry processing")
+    print("Install with: pip install shapely")
+    sys.exit(1)
+
 
-def decimal_default(o):
-    """Handle decimal.Decimal values from ijson (more efficient than JSONEncoder subclass)."""
-    if isinstance(o, decimal.Decimal):
-        return float(o)
-    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+def iter_geojson_features(f):
+    """Yield the features of an open binary GeoJSON file.
+
+    Newline-delimited GeoJSON (GeoJSONSeq, as written by ``osmium export -f
+    geojsonseq``: one Feature per line, optionally prefixed with the RS control
+    character) is parsed line by line with orjson. A regular FeatureCollection is
+    streamed with ijson.
+    """
+    head = f.peek(64)[:64].lstrip()
+    if head.startswith(b"\x1e") or (
+        head.startswith(b'{"type":"Feature"') and not head.startswith(b'{"type":"FeatureCollection"')
+    ):
+        for line in f:
+            line = line.strip(b"\x1e \t\r\n")
+            if line:
+                yield orjson.loads(line)
+    else:
+        yield from ijson.items(f, "features.item", use_float=True)
 
 
 # Initial map center (Lombardsbrücke, Hamburg)
@@ -153,6 +181,58 @@ for _ts in TILESETS:
             break
 
 
+def _build_match_index(tileset_config):
+    """Index a tileset's feature definitions by the tags that can select them.
+
+    Returns (by_tag_value, by_tag, always):
+      by_tag_value: {(tag, value): [def index, ...]} for listed tag values
+      by_tag:       {tag: [def index, ...]} for "*" (any value) matches
+      always:       def indices that cannot be indexed and are always checked
+
+    A definition is indexed under every tag for OR matching, and under its first
+    tag only for match_all (that tag must match too). The index only narrows
+    the candidates; feature_matches_tileset() still runs the full check on them.
+    """
+    by_tag_value = defaultdict(list)
+    by_tag = defaultdict(list)
+    always = []
+    for idx, feature_def in enumerate(tileset_config["features"]):
+        osm_match = feature_def["osm_match"]
+        tags = osm_match.get("tags", {})
+        if not tags:
+            continue  # never matches
+        items = list(tags.items())
+        if osm_match.get("match_all", False):
+            items = items[:1]
+        for tag_key, tag_values in items:
+            if tag_values == ["*"]:
+                by_tag[tag_key].append(idx)
+            elif isinstance(tag_values, list):
+                for value in tag_values:
+                    by_tag_value[(tag_key, value)].append(idx)
+            else:
+                always.append(idx)
+                break
+    return dict(by_tag_value), dict(by_tag), always
+
+
+# (tag, value) -> candidate feature definitions, per tileset id
+TILESET_MATCH_INDEX = {ts["id"]: _build_match_index(ts) for ts in TILESETS}
+
+# Every tag key any tileset definition can match on. A feature carrying none of
+# them cannot match anything and is dropped right after parsing. None disables
+# the check when some definition could not be indexed.
+if any(always for _, _, always in TILESET_MATCH_INDEX.values()):
+    MATCHABLE_TAGS = None
+else:
+    MATCHABLE_TAGS = frozenset(
+        tag_key
+        for ts in TILESETS
+        for feature_def in ts["features"]
+        for tag_key in feature_def["osm_match"].get("tags", {})
+    )
+
+
 def tile_set_bounds(tiles):
     """Return the geographic bounding box covering all (ts, x, y) tiles.
 
@@ -173,6 +253,37 @@ def tile_set_bounds(tiles):
     return b if b["minLon"] != float("inf") else None
 
 
+def merge_bounds(bounds_list):
+    """Return the union of {minLon, maxLon, minLat, maxLat} dicts.
+
+    Missing keys are ignored; an empty list yields the +/-inf sentinel box
+    that callers test with ``bounds["minLon"] == float("inf")``.
+    """
+    inf = float("inf")
+    return {
+        "minLon": min((b.get("minLon", inf) for b in bounds_list), default=inf),
+        "maxLon": max((b.get("maxLon", -inf) for b in bounds_list), default=-inf),
+        "minLat": min((b.get("minLat", inf) for b in bounds_list), default=inf),
+        "maxLat": max((b.get("maxLat", -inf) for b in bounds_list), default=-inf),
+    }
+
+
+def finite_bounds(bounds):
+    """Return bounds if all four edges are finite, else None.
+
+    orjson writes inf/-inf as null, so the ``merge_bounds`` sentinel box must
+    not reach index.json as-is.
+    """
+    if not bounds:
+        return None
+    for key in ("minLon", "maxLon", "minLat", "maxLat"):
+        value = bounds.get(key)
+        # None also covers an index.json written with null edges before this check
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            return None
+    return bounds
+
+
 # ============================================================================
 # LAND POLYGON DATA (pre-computed authoritative land polygons)
 # ============================================================================
@@ -210,7 +321,7 @@ def load_land_polygons(data_dir: Path, bbox=None):
     try:
         # Stream with ijson to handle the large global file
         with open(geojson_path, "rb") as f:
-            for feat in ijson.items(f, "features.item"):
+            for feat in iter_geojson_features(f):
                 try:
                     geom = shape(feat["geometry"])
                     if filter_box is not None and not geom.intersects(filter_box):
@@ -851,7 +962,25 @@ def feature_matches_tileset(feature, tileset_config, props, geom_type):
     Returns:
         Matching feature config dict or None
     """
-    for feature_def in tileset_config["features"]:
+    feature_defs = tileset_config["features"]
+    # Narrow to definitions that reference one of the feature's tags, keeping
+    # config order so the first matching definition still wins.
+    by_tag_value, by_tag, always = TILESET_MATCH_INDEX[tileset_config["id"]]
+    candidates = set(always)
+    for tag_key, prop_value in props.items():
+        if not prop_value:
+            continue
+        if tag_key in by_tag:
+            candidates.update(by_tag[tag_key])
+        if isinstance(prop_value, str):
+            hit = by_tag_value.get((tag_key, prop_value))
+            if hit:
+                candidates.update(hit)
+    if not candidates:
+        return None
+
+    for idx in sorted(candidates):
+        feature_def = feature_defs[idx]
         osm_match = feature_def["osm_match"]
 
         # Check geometry type
@@ -952,28 +1081,36 @@ def simplify_feature_for_tileset(feature, tileset_id, feature_config):
         feature_config: Feature definition from config
 
     Returns:
-        Modified feature with simplified geometry
+        (feature, geometry): the modified feature, and the simplified Shapely
+        geometry when simplification ran (None otherwise) so the clipping path
+        can reuse it instead of rebuilding it from the GeoJSON dict
     """
-    from shapely.geometry import mapping, shape
-
     simplif = feature_config.get("simplification", {})
 
     # Check if simplification disabled for this feature in this tileset
     if simplif.get("disabled", False):
-        return feature
+        return feature, None
 
     epsilon_m = simplif.get("epsilon_m")
     if not epsilon_m:
-        return feature
+        return feature, None
     # Below ~0.5 m the simplification removes essentially no vertices (visual no-op).
     # Skip the Shapely shape()→simplify()→mapping() round-trip — the clipping path
     # will build the Shapely geometry from scratch anyway.
     if epsilon_m < 0.5:
-        return feature
+        return feature, None
 
     geom = feature.get("geometry")
     if not geom or geom["type"] == "Point":
-        return feature
+        return feature, None
+    # Douglas-Peucker always keeps a line's endpoints, so a two-point line
+    # comes back unchanged; only grid snapping could still move it.
+    if (
+        geom["type"] == "LineString"
+        and len(geom["coordinates"]) <= 2
+        and not SIMPLIFICATION_SETTINGS.get("snap_to_grid", False)
+    ):
+        return feature, None
 
     try:
         shapely_geom = shape(geom)
@@ -992,13 +1129,15 @@ def simplify_feature_for_tileset(feature, tileset_id, feature_config):
             grid_size_m = epsilon_m / grid_divisor
             simplified = snap_to_grid(simplified, grid_size_m)
 
+        simplified = _round_geom_coords(simplified)
         feature["geometry"] = mapping(simplified)
+        return feature, simplified
 
     except Exception as e:
         # If simplification fails, keep original
         pass
 
-    return feature
+    return feature, None
 
 
 def _clip_linestring_extend_outside(coords, min_lon, min_lat, max_lon, max_lat):
@@ -1059,8 +1198,6 @@ def _extract_linestring_coords(shapely_geom):
 
     Returns a list of coordinate lists (each with >= 2 points).
     """
-    from shapely.geometry import LineString, MultiLineString, GeometryCollection
-
     geom_type = shapely_geom.geom_type
     if geom_type == "LineString":
         coords = list(shapely_geom.coords)
@@ -1143,8 +1280,6 @@ def clip_feature_to_tile(feature, tile_x, tile_y, tile_size_m, buffer_pct=0.02):
     # approach misses whenever other parts of the same feature are inside the tile.
     if geom_type in ("LineString", "MultiLineString"):
         try:
-            from shapely.geometry import box, shape
-
             shapely_geom = shape(geom)
             tile_box = box(exact_min_lon, exact_min_lat, exact_max_lon, exact_max_lat)
             clipped = shapely_geom.intersection(tile_box)
@@ -1179,8 +1314,6 @@ def clip_feature_to_tile(feature, tile_x, tile_y, tile_size_m, buffer_pct=0.02):
 
     # --- Polygon / MultiPolygon: Shapely intersection (unchanged) ---
     try:
-        from shapely.geometry import box, mapping, shape
-
         shapely_geom = shape(geom)
 
         # Skip clipping if feature is fully within the buffered tile
@@ -1264,6 +1397,17 @@ def snap_to_grid(geom, grid_size_m):
     return geom
 
 
+@functools.lru_cache(maxsize=65536)
+def _tile_width_deg(tile_size_m, y):
+    """Width in degrees of tile row y, evaluated at the row's center latitude.
+
+    Tiles are a fixed grid, so the cos() per row repeats across millions of
+    features; caching it leaves only the floor divisions on the hot path.
+    """
+    tile_center_lat = (y + 0.5) * (tile_size_m / 111320)
+    return tile_size_m / (111320 * math.cos(math.radians(tile_center_lat)))
+
+
 def get_tiles_for_feature_in_tileset(feature, tileset_id, tile_size_m):
     """
     Get tile coordinates for a feature in a specific tileset.
@@ -1278,24 +1422,31 @@ def get_tiles_for_feature_in_tileset(feature, tileset_id, tile_size_m):
     Returns:
         List of (tileset_id, x, y) tuples
     """
+    tile_height_deg = tile_size_m / 111320
+
+    # Points (most POIs) always land in exactly one tile: index it directly
+    # instead of building a bounds dict and walking a one-tile range.
+    geom = feature["geometry"]
+    if geom["type"] == "Point":
+        lon, lat = geom["coordinates"][:2]
+        y = math.floor(lat / tile_height_deg)
+        return [(tileset_id, math.floor(lon / _tile_width_deg(tile_size_m, y)), y)]
+
     bounds = get_feature_bounds(feature)
     if not bounds:
         return []
 
-    tile_height_deg = tile_size_m / 111320
-
-    min_y = int(math.floor(bounds["minLat"] / tile_height_deg))
-    max_y = int(math.floor(bounds["maxLat"] / tile_height_deg))
+    min_y = math.floor(bounds["minLat"] / tile_height_deg)
+    max_y = math.floor(bounds["maxLat"] / tile_height_deg)
+    min_lon = bounds["minLon"]
+    max_lon = bounds["maxLon"]
 
     # For each tile row use that row's center latitude to compute tile_width_deg,
     # matching compute_tile_bounds() exactly so features land in consistent tiles.
     tiles = []
     for y in range(min_y, max_y + 1):
-        tile_center_lat = (y + 0.5) * tile_height_deg
-        tile_width_deg = tile_size_m / (111320 * math.cos(math.radians(tile_center_lat)))
-        min_x = int(math.floor(bounds["minLon"] / tile_width_deg))
-        max_x = int(math.floor(bounds["maxLon"] / tile_width_deg))
-        for x in range(min_x, max_x + 1):
+        tile_width_deg = _tile_width_deg(tile_size_m, y)
+        for x in range(math.floor(min_lon / tile_width_deg), math.floor(max_lon / tile_width_deg) + 1):
             tiles.append((tileset_id, x, y))
 
     return tiles
@@ -1306,37 +1457,32 @@ def get_feature_bounds(feature):
     coords = feature["geometry"]["coordinates"]
     geom_type = feature["geometry"]["type"]
 
-    lons, lats = [], []
-
-    def process_coord(coord):
-        lons.append(float(coord[0]))
-        lats.append(float(coord[1]))
-
     if geom_type == "Point":
-        process_coord(coords)
+        points = (coords,)
     elif geom_type == "LineString":
-        for coord in coords:
-            process_coord(coord)
+        points = coords
     elif geom_type == "Polygon":
-        for coord in coords[0]:
-            process_coord(coord)
+        points = coords[0]
     elif geom_type == "MultiLineString":
-        for line in coords:
-            for coord in line:
-                process_coord(coord)
+        points = [coord for line in coords for coord in line]
     elif geom_type == "MultiPolygon":
-        for polygon in coords:
-            for coord in polygon[0]:
-                process_coord(coord)
+        points = [coord for polygon in coords for coord in polygon[0]]
+    else:
+        return None
 
-    if not lons:
+    if not points:
         return None
 
+    # Transpose once and reduce with the C builtins instead of appending every
+    # vertex in Python. float() only normalizes integral coordinates.
+    axes = zip(*points)
+    lons = next(axes)
+    lats = next(axes)
     return {
-        "minLon": min(lons),
-        "maxLon": max(lons),
-        "minLat": min(lats),
-        "maxLat": max(lats),
+        "minLon": float(min(lons)),
+        "maxLon": float(max(lons)),
+        "minLat": float(min(lats)),
+        "maxLat": float(max(lats)),
     }
 
 
@@ -1510,8 +1656,7 @@ def tiles_in_bounds(bounds, tile_size_m):
     max_y = int(math.floor(bounds["maxLat"] / th))
     result = []
     for y in range(min_y, max_y + 1):
-        tile_center_lat = (y + 0.5) * th
-        tw = tile_size_m / (111320 * math.cos(math.radians(tile_center_lat)))
+        tw = _tile_width_deg(tile_size_m, y)
         min_x = int(math.floor(bounds["minLon"] / tw))
         max_x = int(math.floor(bounds["maxLon"] / tw))
         for x in range(min_x, max_x + 1):
@@ -1551,7 +1696,6 @@ def build_land_polygon_for_tile(tile_x, tile_y, tile_size_m, epsilon_m=None, wat
     if LAND_POLYGON_TREE is None:
         return None
 
-    from shapely.geometry import box, mapping, shape
     from shapely.ops import unary_union
 
     bounds = compute_tile_bounds(tile_x, tile_y, tile_size_m)
@@ -1612,7 +1756,7 @@ def build_land_polygon_for_tile(tile_x, tile_y, tile_size_m, epsilon_m=None, wat
 
     return {
         "type": "Feature",
-        "geometry": mapping(land),
+        "geometry": mapping(_round_geom_coords(land)),
         "properties": {"base_land": True},
         "_render": {
             "layer": "base_land",
@@ -1623,6 +1767,18 @@ def build_land_polygon_for_tile(tile_x, tile_y, tile_size_m, epsilon_m=None, wat
     }
 
 
+def _write_file_bytes(path, data):
+    """Write data to path with raw os.open/os.write (no buffered file object)."""
+    # O_BINARY: os.open defaults to text mode on Windows
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def finalize_tile(tile_jsonl_path, tile_json_path, existing_json_path=None, strip_srcs=None):
     """Read a .jsonl tile, deduplicate, sort by importance, compute _meta, write final .json.
 
@@ -1642,46 +1798,47 @@ def finalize_tile(tile_jsonl_path, tile_json_path, existing_json_path=None, stri
     tileset_id = tile_jsonl_path.parent.parent.name
     tile_size_m = TILESET_TILE_SIZES.get(tileset_id, 50000)
 
-    # Read all lines
-    with open(tile_jsonl_path, "r", encoding="utf-8") as f:
+    # Read all lines; features stay as the raw orjson bytes written in Pass 1
+    with open(tile_jsonl_path, "rb") as f:
         lines = f.readlines()
 
     # Deduplicate and sort by importance (descending)
     seen = set()
-    entries = []  # (importance, feature_json_str)
+    entries = []  # (importance, feature_json_bytes)
     for line in lines:
         line = line.strip()
         if not line:
             continue
-        # Extract importance prefix: "importance\t{json}"
-        tab_idx = line.index("\t")
+        # Extract importance prefix: b"importance\t{json}"
+        tab_idx = line.index(b"\t")
         importance = int(line[:tab_idx])
         feature_json = line[tab_idx + 1 :]
         if feature_json not in seen:
             seen.add(feature_json)
             entries.append((importance, feature_json))
 
-    # Merge with existing .json tile if it exists (multi-region border tiles)
+    # Merge with existing .json tile if it exists (multi-region border tiles).
+    # Just try to open it: on full builds there never is one, and a separate
+    # exists() check would cost an extra stat per tile.
     _existing_source = existing_json_path if existing_json_path is not None else tile_json_path
-    if _existing_source.exists():
-        try:
-            _open = gzip.open if str(_existing_source).endswith(".gz") else open
-            with _open(_existing_source, "rt", encoding="utf-8") as f:
-                existing_tile = json.load(f)
-                for feat in existing_tile.get("features", []):
-                    # Skip stale base_land features — they'll be regenerated fresh
-                    if feat.get("properties", {}).get("base_land"):
-                        continue
-                    # Strip features belonging to regions being updated
-                    if strip_srcs and feat.get("_render", {}).get("_src") in strip_srcs:
-                        continue
-                    feat_str = orjson.dumps(feat).decode()
-                    if feat_str not in seen:
-                        seen.add(feat_str)
-                        # Use importance 5 (medium) for existing features without importance
-                        entries.append((5, feat_str))
-        except:
-            pass
+    try:
+        _open = gzip.open if str(_existing_source).endswith(".gz") else open
+        with _open(_existing_source, "rb") as f:
+            existing_tile = orjson.loads(f.read())
+            for feat in existing_tile.get("features", []):
+                # Skip stale base_land features — they'll be regenerated fresh
+                if feat.get("properties", {}).get("base_land"):
+                    continue
+                # Strip features belonging to regions being updated
+                if strip_srcs and feat.get("_render", {}).get("_src") in strip_srcs:
+                    continue
+                feat_str = orjson.dumps(feat)
+                if feat_str not in seen:
+                    seen.add(feat_str)
+                    # Use importance 5 (medium) for existing features without importance
+                    entries.append((5, feat_str))
+    except:
+        pass  # No existing tile (the usual case) or unreadable: nothing to merge
 
     # Sort by importance descending
     entries.sort(key=lambda e: e[0], reverse=True)
@@ -1691,7 +1848,7 @@ def finalize_tile(tile_jsonl_path, tile_json_path, existing_json_path=None, stri
 
     for importance, feat_str in entries:
         try:
-            feat = json.loads(feat_str)
+            feat = orjson.loads(feat_str)
             props = feat.get("properties", {})
             natural = props.get("natural", "")
             landuse = props.get("landuse", "")
@@ -1740,28 +1897,33 @@ def finalize_tile(tile_jsonl_path, tile_json_path, existing_json_path=None, stri
             if base_feat is not None:
                 has_base_land = True
                 has_land_features = True  # ensure land background fallback
-                feature_strings.insert(0, orjson.dumps(base_feat, default=decimal_default).decode())
+                feature_strings.insert(0, orjson.dumps(base_feat))
         except Exception:
             pass
 
-    # Write final tile as gzip-compressed JSON
-    tile_json_path.parent.mkdir(parents=True, exist_ok=True)
-    with gzip.open(tile_json_path, "wt", compresslevel=1, encoding="utf-8") as f:
-        f.write('{"type":"FeatureCollection",')
-        f.write('"_meta":{"hasLandFeatures":')
-        f.write("true" if has_land_features else "false")
-        f.write(',"hasBaseLand":')
-        f.write("true" if has_base_land else "false")
-        f.write(',"landPolygonsAvailable":')
-        f.write("true" if LAND_POLYGON_TREE is not None else "false")
-        f.write('},"features":[')
-        f.write(",".join(feature_strings))
-        f.write("]}")
+    # Write final tile as gzip-compressed JSON: assemble the document once and
+    # compress it in a single call, then write it with one syscall.
+    header = (
+        b'{"type":"FeatureCollection","_meta":{"hasLandFeatures":%s,"hasBaseLand":%s,'
+        b'"landPolygonsAvailable":%s},"features":['
+    ) % (
+        b"true" if has_land_features else b"false",
+        b"true" if has_base_land else b"false",
+        b"true" if LAND_POLYGON_TREE is not None else b"false",
+    )
+    data = gzip.compress(b"".join((header, b",".join(feature_strings), b"]}")), compresslevel=1)
+    try:
+        _write_file_bytes(tile_json_path, data)
+    except FileNotFoundError:
+        # Full builds write next to the Phase 1 .jsonl, so the directory usually
+        # exists; only create it on a miss instead of a mkdir syscall per tile.
+        tile_json_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_file_bytes(tile_json_path, data)
 
     # Remove intermediate .jsonl
     tile_jsonl_path.unlink()
 
-    return tile_json_path.stat().st_size
+    return len(data)
 
 
 # ── Phase 1 parallel processing ─────────────────────────────────────────────
@@ -1769,32 +1931,54 @@ def finalize_tile(tile_jsonl_path, tile_json_path, existing_json_path=None, stri
 _PHASE1_BATCH_SIZE = 200    # features per worker batch
 _PHASE1_MAX_IN_FLIGHT = 4   # max queued batches per worker before back-pressure drain
 
-# LRU file handle cache — avoids open/close syscall on every tile append
-_tile_handles: dict = {}
-try:
-    import resource as _resource
-    _soft, _ = _resource.getrlimit(_resource.RLIMIT_NOFILE)
-    # Reserve ~50 fds for Python internals, pools, etc.
-    _MAX_OPEN_HANDLES = max(32, _soft - 50)
-except Exception:
-    _MAX_OPEN_HANDLES = 200
-
-
-def _get_tile_handle(path: str):
-    """Return a cached open file handle, evicting the oldest entry when full."""
-    if path not in _tile_handles:
-        if len(_tile_handles) >= _MAX_OPEN_HANDLES:
-            oldest = next(iter(_tile_handles))
-            _tile_handles.pop(oldest).close()
-        _tile_handles[path] = open(path, "a", encoding="utf-8")
-    return _tile_handles[path]
-
-
-def _close_all_tile_handles():
-    """Flush and close all cached tile file handles."""
-    for h in _tile_handles.values():
-        h.close()
-    _tile_handles.clear()
+# In-memory per-tile buckets for Phase 1 output. Lines accumulate in RAM and are
+# appended to the .jsonl files only when the buffered total exceeds the budget
+# (largest buckets first) and once at the end of the pass. Each spill is a single
+# whole-line append per tile, so few syscalls are issued regardless of how many
+# tiles a region touches, and concurrent region processes appending to the same
+# border tile never interleave partial lines.
+_tile_buckets: dict = {}       # jsonl path -> list of line bytes
+_tile_bucket_sizes: dict = {}  # jsonl path -> buffered bytes
+_tile_bucket_total = 0
+_TILE_BUFFER_BUDGET = 128 * 1024 * 1024
+
+
+def _append_tile_line(path: str, line: bytes):
+    """Buffer a line for a tile's .jsonl file, spilling when over budget."""
+    global _tile_bucket_total
+    bucket = _tile_buckets.get(path)
+    if bucket is None:
+        _tile_buckets[path] = [line]
+        _tile_bucket_sizes[path] = len(line)
+    else:
+        bucket.append(line)
+        _tile_bucket_sizes[path] += len(line)
+    _tile_bucket_total += len(line)
+    if _tile_bucket_total > _TILE_BUFFER_BUDGET:
+        _spill_tile_buckets(_TILE_BUFFER_BUDGET // 2)
+
+
+def _spill_tile_buckets(keep_bytes=0):
+    """Append buffered lines to their .jsonl files, largest buckets first,
+    until at most keep_bytes remain in memory (0 flushes everything)."""
+    global _tile_bucket_total
+    for path in sorted(_tile_bucket_sizes, key=_tile_bucket_sizes.__getitem__, reverse=True):
+        if _tile_bucket_total <= keep_bytes:
+            break
+        try:
+            f = open(path, "ab")
+        except FileNotFoundError:
+            # First spill into this tile column: create it here rather than
+            # checking for the directory on the per-line path.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, "ab")
+        with f:
+            f.write(b"".join(_tile_buckets.pop(path)))
+        _tile_bucket_total -= _tile_bucket_sizes.pop(path)
+    if keep_bytes == 0:
+        _tile_buckets.clear()
+        _tile_bucket_sizes.clear()
+        _tile_bucket_total = 0
 
 
 def _try_build_shapely(geom_dict):
@@ -1806,12 +1990,41 @@ def _try_build_shapely(geom_dict):
     if not geom_dict or geom_dict.get("type") == "Point":
         return None
     try:
-        from shapely.geometry import shape
         return shape(geom_dict)
     except Exception:
         return None
 
 
+@functools.lru_cache(maxsize=65536)
+def _tile_clip_box(tile_x, tile_y, tile_size_m, buffer_pct):
+    """Return (bounds, box) of the area a tile clips to, built once per tile.
+
+    bounds is (min_lon, min_lat, max_lon, max_lat) grown by buffer_pct of the
+    tile size on every side (lines pass 0 to clip to the exact tile) and box
+    the matching Shapely polygon. Consecutive features keep hitting the same
+    tiles, so the cos() and box construction are shared instead of repeated
+    per feature and tile.
+    """
+    lat_avg = tile_y * tile_size_m / 111320 + (tile_size_m / 111320 / 2)
+    meters_per_deg_lon = 111320 * math.cos(math.radians(lat_avg))
+    tile_width_deg = tile_size_m / meters_per_deg_lon
+    tile_height_deg = tile_size_m / 111320
+
+    min_lon = tile_x * tile_width_deg
+    min_lat = tile_y * tile_height_deg
+    max_lon = min_lon + tile_width_deg
+    max_lat = min_lat + tile_height_deg
+    if buffer_pct:
+        buf_lon = tile_width_deg * buffer_pct
+        buf_lat = tile_height_deg * buffer_pct
+        min_lon -= buf_lon
+        min_lat -= buf_lat
+        max_lon += buf_lon
+        max_lat += buf_lat
+    bounds = (min_lon, min_lat, max_lon, max_lat)
+    return bounds, box(*bounds)
+
+
 def _clip_geom_to_tile(shapely_geom, tile_x, tile_y, tile_size_m, buffer_pct=0.02):
     """Clip a Shapely geometry to a tile's bounds, returning a Shapely geometry or None.
 
@@ -1819,60 +2032,96 @@ def _clip_geom_to_tile(shapely_geom, tile_x, tile_y, tile_size_m, buffer_pct=0.0
     repeated GeoJSON↔Shapely round-trips when clipping across many tiles.
     """
     try:
-        from shapely.geometry import box
-
         geom_type = shapely_geom.geom_type
-        lat_avg = tile_y * tile_size_m / 111320 + (tile_size_m / 111320 / 2)
-        meters_per_deg_lon = 111320 * math.cos(math.radians(lat_avg))
-        tile_width_deg = tile_size_m / meters_per_deg_lon
-        tile_height_deg = tile_size_m / 111320
-
-        exact_min_lon = tile_x * tile_width_deg
-        exact_min_lat = tile_y * tile_height_deg
-        exact_max_lon = exact_min_lon + tile_width_deg
-        exact_max_lat = exact_min_lat + tile_height_deg
 
         if geom_type in ("LineString", "MultiLineString"):
-            tile_box = box(exact_min_lon, exact_min_lat, exact_max_lon, exact_max_lat)
+            _, tile_box = _tile_clip_box(tile_x, tile_y, tile_size_m, 0.0)
             clipped = shapely_geom.intersection(tile_box)
             if clipped.is_empty:
                 return None
             # Keep only line parts (discard Point artifacts from corner touches)
-            from shapely.geometry import LineString, MultiLineString, GeometryCollection
             if clipped.geom_type in ("LineString", "MultiLineString"):
-                return clipped
+                return _round_geom_coords(clipped)
             if clipped.geom_type == "GeometryCollection":
                 lines = [g for g in clipped.geoms if g.geom_type in ("LineString", "MultiLineString")]
                 if not lines:
                     return None
-                return MultiLineString([list(g.coords) for g in lines]) if len(lines) > 1 else lines[0]
+                return _round_geom_coords(
+                    MultiLineString([list(g.coords) for g in lines])
+                    if len(lines) > 1
+                    else lines[0]
+                )
             return None
 
         # Polygon / MultiPolygon
-        buf_lon = tile_width_deg * buffer_pct
-        buf_lat = tile_height_deg * buffer_pct
-        min_lon = exact_min_lon - buf_lon
-        min_lat = exact_min_lat - buf_lat
-        max_lon = exact_max_lon + buf_lon
-        max_lat = exact_max_lat + buf_lat
+        (min_lon, min_lat, max_lon, max_lat), tile_box = _tile_clip_box(
+            tile_x, tile_y, tile_size_m, buffer_pct
+        )
 
         # Fast-path: feature fully within buffered tile
         gmin_lon, gmin_lat, gmax_lon, gmax_lat = shapely_geom.bounds
         if gmin_lon >= min_lon and gmax_lon <= max_lon and gmin_lat >= min_lat and gmax_lat <= max_lat:
             return shapely_geom
 
-        tile_box = box(min_lon, min_lat, max_lon, max_lat)
         clipped = shapely_geom.intersection(tile_box)
-        return None if clipped.is_empty else clipped
+        return None if clipped.is_empty else _round_geom_coords(clipped)
 
     except Exception:
         return None
 
 
+# Below this many candidate tiles the per-tile clip loop is cheap enough on its own
+_TILE_PREFILTER_MIN = 8
+
+
+# Decimal places kept for derived coordinates: 1e-7 deg is ~1 cm, the precision
+# OSM stores and osmium exports, so source vertices pass through unchanged.
+COORDINATE_DECIMALS = 7
+
+
+def _round_coord_array(coords):
+    return coords.round(COORDINATE_DECIMALS)
+
+
+def _round_geom_coords(shapely_geom):
+    """Round every coordinate of a Shapely geometry to COORDINATE_DECIMALS.
+
+    Intersections, simplification and grid snapping produce full-precision
+    doubles (15+ digits) that orjson writes out verbatim; one vectorized pass
+    over the coordinate array trims them back to OSM's own precision.
+    """
+    return shapely.transform(shapely_geom, _round_coord_array)
+
+
+def _tiles_touching_geom(shapely_geom, feature_tiles, tile_size_m, buffer_pct=0.02):
+    """Drop tiles whose clip box the geometry does not intersect.
+
+    feature_tiles covers the feature's whole bounding box, so a long diagonal
+    line or an L-shaped polygon produces many tiles that _clip_geom_to_tile()
+    would only intersect to find empty. One vectorized intersects() call against
+    the same clip boxes _clip_geom_to_tile uses (exact for lines, buffered for
+    polygons) removes them up front.
+    """
+    if len(feature_tiles) < _TILE_PREFILTER_MIN:
+        return feature_tiles
+    try:
+        is_line = shapely_geom.geom_type in ("LineString", "MultiLineString")
+        clip_pct = 0.0 if is_line else buffer_pct
+        boxes = [
+            _tile_clip_box(tile_x, tile_y, tile_size_m, clip_pct)[1]
+            for _, tile_x, tile_y in feature_tiles
+        ]
+        shapely.prepare(shapely_geom)
+        hits = shapely.intersects(shapely_geom, boxes)
+        return [tile for tile, hit in zip(feature_tiles, hits.tolist()) if hit]
+    except Exception:
+        return feature_tiles
+
+
 def _process_feature_batch(args):
     """Worker: process a batch of features and return write tuples.
 
-    Returns list of (ts, x, y, importance, json_str).
+    Returns list of (ts, x, y, line) with line the ready-to-append .jsonl bytes.
     Runs in a worker process — uses only module-level globals and pure functions.
     """
     batch, clip_to_tiles, clip_buffer_pct, region_short_name = args
@@ -1880,27 +2129,34 @@ def _process_feature_batch(args):
     for feature in batch:
         props = feature.get("properties", {})
         geom_type = feature["geometry"]["type"]
+        # Importance depends only on the tags, not the tileset: classify once per feature
+        _, importance = classify_feature_importance(props, geom_type)
         for tileset_config in TILESETS:
             tileset_id = tileset_config["id"]
             tile_size_m = tileset_config["tile_size_meters"]
             feature_config = feature_matches_tileset(feature, tileset_config, props, geom_type)
             if not feature_config:
                 continue
-            tileset_feature = copy.deepcopy(feature)
-            tileset_feature = simplify_feature_for_tileset(tileset_feature, tileset_id, feature_config)
+            # Shallow copy: simplification and _render only replace top-level
+            # keys, so geometry and properties can be shared between tilesets.
+            tileset_feature = dict(feature)
+            tileset_feature, simplified_geom = simplify_feature_for_tileset(
+                tileset_feature, tileset_id, feature_config
+            )
             tileset_feature["_render"] = dict(feature_config["render"])
             augment_render_from_props(tileset_feature["_render"], props, geom_type)
             tileset_feature["_render"]["_src"] = region_short_name
             feature_tiles = get_tiles_for_feature_in_tileset(tileset_feature, tileset_id, tile_size_m)
-            _, importance = classify_feature_importance(props, geom_type)
             if clip_to_tiles and len(feature_tiles) > 1:
                 # Build Shapely geometry once from the simplified feature; reuse across all tiles
                 # to avoid repeated shape() conversions and deepcopy per tile.
-                _shapely_geom = _try_build_shapely(tileset_feature.get("geometry"))
+                _shapely_geom = simplified_geom
+                if _shapely_geom is None:
+                    _shapely_geom = _try_build_shapely(tileset_feature.get("geometry"))
                 # Check whether this feature type should be skipped by clip_feature_to_tile
                 _skip_clip = props.get("building") or props.get("railway") == "platform" or props.get("public_transport") == "platform"
                 if _shapely_geom is not None and not _skip_clip:
-                    from shapely.geometry import mapping as _shapely_mapping
+                    feature_tiles = _tiles_touching_geom(_shapely_geom, feature_tiles, tile_size_m, clip_buffer_pct)
                 for tile_coords in feature_tiles:
                     ts, x, y = tile_coords
                     if _shapely_geom is not None and not _skip_clip:
@@ -1909,20 +2165,20 @@ def _process_feature_batch(args):
                             continue
                         clipped = {
                             "type": "Feature",
-                            "geometry": _shapely_mapping(clipped_geom),
+                            "geometry": mapping(clipped_geom),
                             "properties": tileset_feature["properties"],
                             "_render": tileset_feature["_render"],
                         }
                     else:
                         # Fallback for Points, buildings, and platforms (no clipping needed)
                         clipped = tileset_feature
-                    clipped_json = orjson.dumps(clipped, default=decimal_default).decode()
-                    results.append((ts, x, y, importance, clipped_json))
+                    clipped_json = orjson.dumps(clipped)
+                    results.append((ts, x, y, b"%d\t%s\n" % (importance, clipped_json)))
             else:
-                feature_json = orjson.dumps(tileset_feature, default=decimal_default).decode()
+                line = b"%d\t%s\n" % (importance, orjson.dumps(tileset_feature))
                 for tile_coords in feature_tiles:
                     ts, x, y = tile_coords
-                    results.append((ts, x, y, importance, feature_json))
+                    results.append((ts, x, y, line))
     return results
 
 
@@ -1976,24 +2232,25 @@ def split_geojson_into_tiles(
 
     # Track all .jsonl files written per tileset for finalization
     tile_files_written = defaultdict(set)  # tileset_id -> set of (x, y)
-    # Cache which directories have been created
-    created_dirs = set()
+    # (ts, x, y) -> .jsonl path, so the path is only built on a tile's first line.
+    # Directories are created when a tile is first spilled (_spill_tile_buckets).
+    tile_paths = {}
+    output_root = str(output_path)
 
     def append_to_tile(ts, x, y, line):
-        """Append a line to a tile's .jsonl file (uses cached file handle)."""
-        tile_dir = output_path / str(ts) / str(x)
-        dir_key = (ts, x)
-        if dir_key not in created_dirs:
-            tile_dir.mkdir(parents=True, exist_ok=True)
-            created_dirs.add(dir_key)
-        _get_tile_handle(str(tile_dir / f"{y}.jsonl")).write(line)
+        """Append a line to a tile's .jsonl file (buffered in memory until spilled)."""
+        key = (ts, x, y)
+        path = tile_paths.get(key)
+        if path is None:
+            path = tile_paths[key] = os.path.join(output_root, str(ts), str(x), f"{y}.jsonl")
+            tile_files_written[ts].add((x, y))
+        _append_tile_line(path, line)
+        stats[ts] += 1
 
     def write_batch_results(results):
-        """Write (ts, x, y, importance, json_str) tuples from a worker batch."""
-        for ts, x, y, importance, json_str in results:
-            append_to_tile(ts, x, y, f"{importance}\t{json_str}\n")
-            tile_files_written[ts].add((x, y))
-            stats[ts] += 1
+        """Write (ts, x, y, line) tuples from a worker batch."""
+        for ts, x, y, line in results:
+            append_to_tile(ts, x, y, line)
 
     # Pass 1: Stream features directly to .jsonl tile files
     stats = defaultdict(int)
@@ -2019,9 +2276,17 @@ def split_geojson_into_tiles(
     _futures: list = []
 
     with open(geojson_file, "rb") as f:
-        _executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+        _executor = (
+            ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_tile_worker,
+                initargs=(_DATA_DIR, TILESET_IDS),
+            )
+            if n_workers > 1
+            else None
+        )
         try:
-            for feature in ijson.items(f, "features.item"):
+            for feature in iter_geojson_features(f):
                 i += 1
 
                 # Progress reporting
@@ -2071,6 +2336,11 @@ def split_geojson_into_tiles(
                         estimated_features = 10000
                     next_check_at = i + estimated_features
 
+                # Early reject: no tag any tileset could match on. Skips classification
+                # and, on the parallel path, pickling the feature to a worker.
+                if MATCHABLE_TAGS is not None and MATCHABLE_TAGS.isdisjoint(feature.get("properties", ())):
+                    continue
+
                 if _executor is not None:
                     # Parallel path: accumulate into batch, dispatch to worker pool
                     _batch.append(feature)
@@ -2087,6 +2357,7 @@ def split_geojson_into_tiles(
                     # Sequential path: process feature immediately (original logic)
                     props = feature.get("properties", {})
                     geom_type = feature["geometry"]["type"]
+                    _, importance = classify_feature_importance(props, geom_type)
 
                     for tileset_config in TILESETS:
                         tileset_id = tileset_config["id"]
@@ -2098,8 +2369,10 @@ def split_geojson_into_tiles(
                         if not feature_config:
                             continue
 
-                        tileset_feature = copy.deepcopy(feature)
-                        tileset_feature = simplify_feature_for_tileset(
+                        # Shallow copy: simplification and _render only replace
+                        # top-level keys, so geometry and properties are shared.
+                        tileset_feature = dict(feature)
+                        tileset_feature, simplified_geom = simplify_feature_for_tileset(
                             tileset_feature, tileset_id, feature_config
                         )
                         tileset_feature["_render"] = dict(feature_config["render"])
@@ -2110,13 +2383,15 @@ def split_geojson_into_tiles(
                             tileset_feature, tileset_id, tile_size_m
                         )
 
-                        _, importance = classify_feature_importance(props, geom_type)
-
                         if clip_to_tiles and len(feature_tiles) > 1:
-                            _shapely_geom = _try_build_shapely(tileset_feature.get("geometry"))
+                            _shapely_geom = simplified_geom
+                            if _shapely_geom is None:
+                                _shapely_geom = _try_build_shapely(tileset_feature.get("geometry"))
                             _skip_clip = props.get("building") or props.get("railway") == "platform" or props.get("public_transport") == "platform"
                             if _shapely_geom is not None and not _skip_clip:
-                                from shapely.geometry import mapping as _shapely_mapping
+                                feature_tiles = _tiles_touching_geom(
+                                    _shapely_geom, feature_tiles, tile_size_m, clip_buffer_pct
+                                )
                             for tile_coords in feature_tiles:
                                 ts, x, y = tile_coords
                                 if _shapely_geom is not None and not _skip_clip:
@@ -2125,23 +2400,19 @@ def split_geojson_into_tiles(
                                         continue
                                     clipped = {
                                         "type": "Feature",
-                                        "geometry": _shapely_mapping(clipped_geom),
+                                        "geometry": mapping(clipped_geom),
                                         "properties": tileset_feature["properties"],
                                         "_render": tileset_feature["_render"],
                                     }
                                 else:
                                     clipped = tileset_feature
-                                clipped_json = orjson.dumps(clipped, default=decimal_default).decode()
-                                append_to_tile(ts, x, y, f"{importance}\t{clipped_json}\n")
-                                tile_files_written[ts].add((x, y))
-                                stats[ts] += 1
+                                clipped_json = orjson.dumps(clipped)
+                                append_to_tile(ts, x, y, b"%d\t%s\n" % (importance, clipped_json))
                         else:
-                            feature_json = orjson.dumps(tileset_feature, default=decimal_default).decode()
+                            line = b"%d\t%s\n" % (importance, orjson.dumps(tileset_feature))
                             for tile_coords in feature_tiles:
                                 ts, x, y = tile_coords
-                                append_to_tile(ts, x, y, f"{importance}\t{feature_json}\n")
-                                tile_files_written[ts].add((x, y))
-                                stats[ts] += 1
+                                append_to_tile(ts, x, y, line)
 
         finally:
             if _executor is not None:
@@ -2154,7 +2425,7 @@ def split_geojson_into_tiles(
                 for fut in _futures:
                     write_batch_results(fut.result())
                 _executor.shutdown(wait=True)
-            _close_all_tile_handles()
+            _spill_tile_buckets()
 
     if is_interactive():
         print(
@@ -2255,8 +2526,7 @@ def split_geojson_into_tiles(
 
 def process_geojson_to_tiles(args):
     """Process a single GeoJSON file into tiles."""
-    geojson_file, output_dir, source_file, clip_to_tiles, clip_buffer_pct, defer_finalization, active_tileset_ids, n_workers = args
-    _apply_tileset_filter(active_tileset_ids)
+    geojson_file, output_dir, source_file, clip_to_tiles, clip_buffer_pct, defer_finalization, n_workers = args
 
     geojson_path = Path(geojson_file)
 
@@ -2297,6 +2567,64 @@ def _finalize_tile_worker(args):
     return finalize_tile(Path(jsonl_path), Path(json_path), existing, strip_srcs=strip_srcs)
 
 
+def _write_regions(tile_args, jobs):
+    """Phase 1: stream each region's features to .jsonl files. Returns the results.
+
+    tile_args are process_geojson_to_tiles() tuples whose trailing n_workers slot
+    is filled in here: the jobs budget is split between regions running side by
+    side and each region's feature batch workers. The outer level uses
+    ProcessPoolExecutor rather than multiprocessing.Pool because its workers are
+    not daemonic, so a region can still start its own batch workers instead of
+    falling back to a single core.
+    """
+    if not tile_args:
+        return []
+    n_outer = min(jobs, len(tile_args))
+    n_inner = max(1, jobs // n_outer)
+    tile_args = [t[:-1] + (n_inner,) for t in tile_args]
+    if n_outer == 1:
+        return [process_geojson_to_tiles(t) for t in tile_args]
+    with ProcessPoolExecutor(
+        max_workers=n_outer,
+        initializer=_init_tile_worker,
+        initargs=(_DATA_DIR, TILESET_IDS),
+    ) as executor:
+        futures = [executor.submit(process_geojson_to_tiles, t) for t in tile_args]
+        return [
+            future.result()
+            for future in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc="Writing regions",
+                unit="region",
+                disable=not is_interactive(),
+            )
+        ]
+
+
+def _finalize_tiles(finalize_args, jobs, land_bounds):
+    """Phase 2: run _finalize_tile_worker over finalize_args in a pool; return total bytes."""
+    n_workers = min(jobs, max(len(finalize_args), 1))
+    # A tile takes milliseconds, so ship several per IPC round-trip; keep ~8
+    # chunks per worker so stragglers still balance and the bar stays live.
+    chunksize = max(1, min(64, len(finalize_args) // (n_workers * 8)))
+    # Order by output path so each chunk covers neighbouring tiles of one
+    # tileset/x column: a worker then creates and fills one directory at a
+    # time instead of touching columns scattered across the tree.
+    finalize_args = sorted(finalize_args, key=lambda a: a[1])
+    with Pool(n_workers, initializer=init_land_polygons, initargs=(_DATA_DIR, land_bounds)) as pool:
+        byte_counts = list(
+            tqdm(
+                pool.imap_unordered(_finalize_tile_worker, finalize_args, chunksize=chunksize),
+                total=len(finalize_args),
+                desc="Finalizing tiles",
+                unit="tile",
+                disable=not is_interactive(),
+            )
+        )
+    return sum(b for b in byte_counts if b)
+
+
 def _categorize_feature(feature):
     """Categorize a feature by its primary OSM tag for statistics."""
     props = feature.get("properties", {})
@@ -2335,7 +2663,7 @@ def _count_coordinates(geometry):
     elif geom_type in ("LineString", "MultiPoint"):
         return len(coords)
     elif geom_type in ("Polygon", "MultiLineString"):
-        return sum(len(ring) for ring in coords)
+        return sum(map(len, coords))
     elif geom_type == "MultiPolygon":
         return sum(len(ring) for polygon in coords for ring in polygon)
     return 0
@@ -2352,13 +2680,90 @@ def _format_size(num_bytes):
     return f"{num_bytes} B"
 
 
-def compute_tile_statistics(tile_dir, output_file=None, max_sample=1000):
+def _scan_tile_files(root):
+    """Yield os.DirEntry objects for every *.json.gz tile below root.
+
+    Iterative os.scandir walk: no Path objects or glob matching per entry,
+    which dominates rglob() on tilesets with tens of thousands of tiles.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".json.gz"):
+                    yield entry
+
+
+def _count_tile_files(root):
+    """Count *.json.gz tiles below root (0 if root does not exist)."""
+    return sum(1 for _ in _scan_tile_files(root))
+
+
+def _tileset_statistics(args):
+    """Worker: sample one tileset's tiles and aggregate per-group/category sizes."""
+    tileset_path, max_sample = args
+    # Collect all tile files
+    tile_files = list(_scan_tile_files(tileset_path))
+    if not tile_files:
+        return None
+
+    total_tiles = len(tile_files)
+    actual_disk_size = sum(f.stat().st_size for f in tile_files)
+
+    # Sample
+    if total_tiles <= max_sample:
+        sampled = tile_files
+    else:
+        sampled = random.sample(tile_files, max_sample)
+
+    # Collect stats per category
+    group_stats = defaultdict(lambda: {"bytes": 0, "features": 0, "coords": 0})
+    category_stats = defaultdict(lambda: {"bytes": 0, "features": 0, "coords": 0})
+
+    for tile_file in sampled:
+        try:
+            with gzip.open(tile_file.path, "rb") as f:
+                data = orjson.loads(f.read())
+        except (json.JSONDecodeError, IOError):
+            continue
+
+        features = data.get("features", []) if isinstance(data, dict) else data
+        for feat in features:
+            feat_bytes = len(orjson.dumps(feat))
+            coord_count = _count_coordinates(feat.get("geometry", {}))
+            group, category = _categorize_feature(feat)
+
+            group_stats[group]["bytes"] += feat_bytes
+            group_stats[group]["features"] += 1
+            group_stats[group]["coords"] += coord_count
+
+            category_stats[category]["bytes"] += feat_bytes
+            category_stats[category]["features"] += 1
+            category_stats[category]["coords"] += coord_count
+
+    return {
+        "total_tiles": total_tiles,
+        "actual_disk_size": actual_disk_size,
+        "sampled": len(sampled),
+        "group_stats": dict(group_stats),
+        "category_stats": dict(category_stats),
+    }
+
+
+def compute_tile_statistics(tile_dir, output_file=None, max_sample=1000, jobs=None):
     """Compute per-tileset statistics by sampling tiles.
 
     Args:
         tile_dir: Path to generated tiles directory
         output_file: Path to write statistics report (default: tile_dir/statistics.md)
         max_sample: Max tiles to sample per tileset
+        jobs: Max worker processes (one tileset per worker; default: CPU count)
     """
     tile_dir = Path(tile_dir)
     if output_file is None:
@@ -2385,58 +2790,36 @@ def compute_tile_statistics(tile_dir, output_file=None, max_sample=1000):
     )
     lines.append("")
 
-    for tileset_id in sorted(
+    tileset_ids = sorted(
         d.name for d in tile_dir.iterdir() if d.is_dir() and d.name.startswith("t")
-    ):
-        tileset_path = tile_dir / tileset_id
-        # Collect all tile files
-        tile_files = list(tileset_path.rglob("*.json.gz"))
-        if not tile_files:
-            continue
-
-        total_tiles = len(tile_files)
-        actual_disk_size = sum(f.stat().st_size for f in tile_files)
-
-        # Sample
-        if total_tiles <= max_sample:
-            sampled = tile_files
-        else:
-            sampled = random.sample(tile_files, max_sample)
-
-        sample_ratio = total_tiles / len(sampled)
-        sample_pct = len(sampled) / total_tiles * 100
-
-        # Collect stats per category
-        group_stats = defaultdict(lambda: {"bytes": 0, "features": 0, "coords": 0})
-        category_stats = defaultdict(lambda: {"bytes": 0, "features": 0, "coords": 0})
-
-        for tile_file in sampled:
-            try:
-                with gzip.open(tile_file, "rt", encoding="utf-8") as f:
-                    data = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                continue
-
-            features = data.get("features", []) if isinstance(data, dict) else data
-            for feat in features:
-                feat_bytes = len(orjson.dumps(feat))
-                coord_count = _count_coordinates(feat.get("geometry", {}))
-                group, category = _categorize_feature(feat)
+    )
+    # Tilesets are independent and sampling is gzip + JSON parse bound
+    stats_args = [(tile_dir / tileset_id, max_sample) for tileset_id in tileset_ids]
+    n_workers = min(jobs or os.cpu_count() or 1, max(len(stats_args), 1))
+    if n_workers > 1:
+        with Pool(n_workers) as pool:
+            tileset_results = pool.map(_tileset_statistics, stats_args)
+    else:
+        tileset_results = [_tileset_statistics(a) for a in stats_args]
 
-                group_stats[group]["bytes"] += feat_bytes
-                group_stats[group]["features"] += 1
-                group_stats[group]["coords"] += coord_count
+    for tileset_id, result in zip(tileset_ids, tileset_results):
+        if result is None:
+            continue
 
-                category_stats[category]["bytes"] += feat_bytes
-                category_stats[category]["features"] += 1
-                category_stats[category]["coords"] += coord_count
+        total_tiles = result["total_tiles"]
+        actual_disk_size = result["actual_disk_size"]
+        group_stats = result["group_stats"]
+        category_stats = result["category_stats"]
+        sampled = result["sampled"]
+        sample_ratio = total_tiles / sampled
+        sample_pct = sampled / total_tiles * 100
 
         # Write tileset section
         lines.append(f"## {tileset_id.upper()}")
         lines.append("")
         lines.append(f"- **Tiles:** {total_tiles:,}")
         lines.append(f"- **Actual disk size:** {_format_size(actual_disk_size)}")
-        lines.append(f"- **Sampled:** {len(sampled)} tiles ({sample_pct:.1f}%)")
+        lines.append(f"- **Sampled:** {sampled} tiles ({sample_pct:.1f}%)")
 
         total_sampled_bytes = sum(s["bytes"] for s in group_stats.values())
         estimated_total = total_sampled_bytes * sample_ratio
@@ -2516,14 +2899,24 @@ def _apply_tileset_filter(tileset_ids):
                 break
 
 
+def _init_tile_worker(data_dir, tileset_ids):
+    """Pool initializer: apply the main process's data dir and tileset filter once per worker.
+
+    Forked workers inherit both, but spawned ones (macOS/Windows) re-import this
+    module with the defaults, so they are set here instead of on every task.
+    """
+    global _DATA_DIR
+    _DATA_DIR = data_dir
+    _apply_tileset_filter(tileset_ids)
+
+
 def _write_regions_json(output_dir, all_results):
     """Write/update regions.json from a list of process_geojson_to_tiles results."""
     regions_path = output_dir / "regions.json"
     # Load existing if present (for --add merges)
     if regions_path.exists():
         try:
-            with open(regions_path) as f:
-                data = json.load(f)
+            data = orjson.loads(regions_path.read_bytes())
         except Exception:
             data = {"version": 1, "regions": {}}
     else:
@@ -2546,8 +2939,8 @@ def _write_regions_json(output_dir, all_results):
             "geojson_mtime": mtime,
         }
 
-    with open(regions_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    with open(regions_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 def _write_region_tile_index(output_dir, region_name, tile_files_written):
@@ -2556,8 +2949,8 @@ def _write_region_tile_index(output_dir, region_name, tile_files_written):
     regions_dir.mkdir(parents=True, exist_ok=True)
     index = {ts: [[x, y] for x, y in sorted(coords)] for ts, coords in tile_files_written.items()}
     out_path = regions_dir / f"{region_name}.tiles.json.gz"
-    with gzip.open(out_path, "wt", encoding="utf-8") as f:
-        json.dump(index, f, separators=(",", ":"))
+    with gzip.open(out_path, "wb", compresslevel=1) as f:
+        f.write(orjson.dumps(index))
 
 
 def _load_region_tile_index(output_dir, region_name):
@@ -2566,8 +2959,8 @@ def _load_region_tile_index(output_dir, region_name):
     if not out_path.exists():
         return None
     try:
-        with gzip.open(out_path, "rt", encoding="utf-8") as f:
-            data = json.load(f)
+        with gzip.open(out_path, "rb") as f:
+            data = orjson.loads(f.read())
         return {ts: {(int(x), int(y)) for x, y in coords} for ts, coords in data.items()}
     except Exception:
         return None
@@ -2606,27 +2999,11 @@ def _run_add_mode(args, geojson_files, regions_data):
                 args.clip,
                 args.clip_buffer,
                 True,  # defer_finalization
-                TILESET_IDS,
                 None,  # n_workers placeholder, filled below
             ))
-        n_outer = min(args.jobs, len(tile_args))
-        n_inner = max(1, args.jobs // n_outer)
-        tile_args = [t[:-1] + (n_inner,) for t in tile_args]
 
         _log("Phase 1: Writing features...")
-        if n_outer == 1:
-            write_results = [process_geojson_to_tiles(tile_args[0])]
-        else:
-            with Pool(n_outer) as pool:
-                write_results = list(
-                    tqdm(
-                        pool.imap_unordered(process_geojson_to_tiles, tile_args),
-                        total=len(tile_args),
-                        desc="Writing regions",
-                        unit="region",
-                        disable=not is_interactive(),
-                    )
-                )
+        write_results = _write_regions(tile_args, args.jobs)
 
         # Build tile file map: (ts, x, y) -> (jsonl in temp, json in LIVE dir)
         all_tile_files_written = {}
@@ -2649,29 +3026,17 @@ def _run_add_mode(args, geojson_files, regions_data):
             (jsonl, live_json, live_json, None)
             for (ts, x, y), (jsonl, live_json) in all_tile_files_written.items()
         ]
-        n_workers = min(args.jobs, max(len(finalize_args), 1))
-        with Pool(n_workers, initializer=init_land_polygons, initargs=(_DATA_DIR, expanded_merged_bounds)) as pool:
-            byte_counts = list(
-                tqdm(
-                    pool.imap_unordered(_finalize_tile_worker, finalize_args),
-                    total=len(finalize_args),
-                    desc="Finalizing tiles",
-                    unit="tile",
-                    disable=not is_interactive(),
-                )
-            )
-        total_bytes = sum(b for b in byte_counts if b)
+        total_bytes = _finalize_tiles(finalize_args, args.jobs, expanded_merged_bounds)
 
         # --- Update index.json ---
         index_path = args.output_dir / "index.json"
         if index_path.exists():
             try:
-                with open(index_path) as f:
-                    index_data = json.load(f)
-                old_bounds = index_data.get("bounds", {
+                index_data = orjson.loads(index_path.read_bytes())
+                old_bounds = finite_bounds(index_data.get("bounds")) or {
                     "minLon": float("inf"), "maxLon": float("-inf"),
                     "minLat": float("inf"), "maxLat": float("-inf"),
-                })
+                }
             except Exception:
                 old_bounds = {
                     "minLon": float("inf"), "maxLon": float("-inf"),
@@ -2683,30 +3048,27 @@ def _run_add_mode(args, geojson_files, regions_data):
                 "minLat": float("inf"), "maxLat": float("-inf"),
             }
 
-        new_bounds = dict(old_bounds)
-        for r in write_results:
-            if r["status"] == "success" and r.get("bounds") and "land-polygon" not in r["name"]:
-                b = r["bounds"]
-                new_bounds["minLon"] = min(new_bounds.get("minLon", float("inf")), b["minLon"])
-                new_bounds["maxLon"] = max(new_bounds.get("maxLon", float("-inf")), b["maxLon"])
-                new_bounds["minLat"] = min(new_bounds.get("minLat", float("inf")), b["minLat"])
-                new_bounds["maxLat"] = max(new_bounds.get("maxLat", float("-inf")), b["maxLat"])
+        new_bounds = merge_bounds([old_bounds] + [
+            r["bounds"] for r in write_results
+            if r["status"] == "success" and r.get("bounds") and "land-polygon" not in r["name"]
+        ])
 
         all_config_tileset_ids = [ts["id"] for ts in TILESET_CONFIG["tilesets"]]
         tile_count = sum(
-            len(list((args.output_dir / ts_id).rglob("*.json.gz")))
-            for ts_id in all_config_tileset_ids
-            if (args.output_dir / ts_id).exists()
+            _count_tile_files(args.output_dir / ts_id) for ts_id in all_config_tileset_ids
         )
         index_data_new = {
-            "bounds": new_bounds,
             "tilesets": all_config_tileset_ids,
             "tile_count": tile_count,
             "center": {"lon": HAMBURG_CENTER_LON, "lat": HAMBURG_CENTER_LAT},
             "generated": int(time.time() * 1000),
         }
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(index_data_new, f, indent=2)
+        # Omitted rather than written as nulls when no region had valid bounds
+        new_bounds = finite_bounds(new_bounds)
+        if new_bounds is not None:
+            index_data_new = {"bounds": new_bounds, **index_data_new}
+        with open(index_path, "wb") as f:
+            f.write(orjson.dumps(index_data_new, option=orjson.OPT_INDENT_2))
         print(f"  ✓ Updated index.json ({tile_count:,} tiles, {_format_size(total_bytes)})")
 
         # --- Update regions.json ---
@@ -2816,6 +3178,12 @@ def main():
     global _DATA_DIR
     _DATA_DIR = args.data_dir
 
+    if ijson.backend != "yajl2_c":
+        _log(
+            f"Warning: ijson is using the '{ijson.backend}' backend; streaming will be slow. "
+            "Install an ijson build with the yajl2_c extension."
+        )
+
     # --- --regen-tilesets: rebuild specific tilesets for all regions, then swap ---
     if args.regen_tilesets:
         _apply_tileset_filter(args.regen_tilesets)
@@ -2831,8 +3199,7 @@ def main():
         regions_json_path = args.output_dir / "regions.json"
         if regions_json_path.exists():
             try:
-                with open(regions_json_path) as f:
-                    regions_data = json.load(f)
+                regions_data = orjson.loads(regions_json_path.read_bytes())
             except Exception:
                 regions_data = {"version": 1, "regions": {}}
         else:
@@ -2876,16 +3243,12 @@ def main():
         if not regions_json_path.exists():
             print("Error: regions.json not found in output dir. Run a full build first.")
             sys.exit(1)
-        with open(regions_json_path) as f:
-            regions_data = json.load(f)
+        regions_data = orjson.loads(regions_json_path.read_bytes())
         regions = regions_data.get("regions", {})
 
         # Validate target regions and collect GeoJSON paths
         target_geojsons = []
-        union_bounds = {
-            "minLon": float("inf"), "maxLon": float("-inf"),
-            "minLat": float("inf"), "maxLat": float("-inf"),
-        }
+        region_bounds = []
         for name in args.update:
             if name not in regions:
                 print(f"Error: Region '{name}' not found in regions.json")
@@ -2898,11 +3261,8 @@ def main():
                 if candidate.exists():
                     geojson_path = candidate
             target_geojsons.append(geojson_path)
-            b = entry["bounds"]
-            union_bounds["minLon"] = min(union_bounds["minLon"], b["minLon"])
-            union_bounds["maxLon"] = max(union_bounds["maxLon"], b["maxLon"])
-            union_bounds["minLat"] = min(union_bounds["minLat"], b["minLat"])
-            union_bounds["maxLat"] = max(union_bounds["maxLat"], b["maxLat"])
+            region_bounds.append(entry["bounds"])
+        union_bounds = merge_bounds(region_bounds)
 
         target_names = set(args.update)
 
@@ -2969,26 +3329,11 @@ def main():
                     args.clip,
                     args.clip_buffer,
                     True,  # defer_finalization
-                    TILESET_IDS,
                     None,  # n_workers placeholder, filled below
                 ))
-            n_outer = min(args.jobs, len(tile_args))
-            n_inner = max(1, args.jobs // n_outer)
-            tile_args = [t[:-1] + (n_inner,) for t in tile_args]
 
             print("\nPhase 1: Writing features...")
-            if n_outer == 1:
-                write_results = [process_geojson_to_tiles(tile_args[0])]
-            else:
-                with Pool(n_outer) as pool:
-                    write_results = list(
-                        tqdm(
-                            pool.imap_unordered(process_geojson_to_tiles, tile_args),
-                            total=len(tile_args),
-                            desc="Writing regions",
-                            unit="region",
-                        )
-                    )
+            write_results = _write_regions(tile_args, args.jobs)
 
             # Expand affected_tiles with any new tiles from this build
             for r in write_results:
@@ -3017,17 +3362,7 @@ def main():
                 finalize_args.append((jsonl, staging_json, live_json, strip_srcs))
 
             print(f"\nPhase 2: Finalizing {len(finalize_args):,} tiles to staging...")
-            n_workers = min(args.jobs, max(len(finalize_args), 1))
-            with Pool(n_workers, initializer=init_land_polygons, initargs=(_DATA_DIR, expanded_merged_bounds)) as pool:
-                byte_counts = list(
-                    tqdm(
-                        pool.imap_unordered(_finalize_tile_worker, finalize_args),
-                        total=len(finalize_args),
-                        desc="Finalizing tiles",
-                        unit="tile",
-                    )
-                )
-            total_bytes = sum(b for b in byte_counts if b)
+            total_bytes = _finalize_tiles(finalize_args, args.jobs, expanded_merged_bounds)
 
             # Phase 3: Atomic swap staging → live
             print("\nPhase 3: Swapping tiles atomically...")
@@ -3066,8 +3401,7 @@ def main():
         regions_json_path = args.output_dir / "regions.json"
         if regions_json_path.exists():
             try:
-                with open(regions_json_path) as f:
-                    regions_data = json.load(f)
+                regions_data = orjson.loads(regions_json_path.read_bytes())
             except Exception:
                 regions_data = {"version": 1, "regions": {}}
         else:
@@ -3109,11 +3443,12 @@ def main():
 
         # Sort files by size (largest first) for efficient border tile merging
         if files_to_process:
-            files_to_process.sort(key=lambda f: f.stat().st_size, reverse=True)
+            sizes = {f: f.stat().st_size for f in files_to_process}
+            files_to_process.sort(key=sizes.__getitem__, reverse=True)
             print(f"\nWill process {len(files_to_process)} GeoJSON file(s)")
             print("  Processing order (largest to smallest):")
             for gj in files_to_process:
-                size_mb = gj.stat().st_size / (1024 * 1024)
+                size_mb = sizes[gj] / (1024 * 1024)
                 name = gj.stem.replace("-latest.osm", "").replace("-", " ").title()
                 print(f"    • {name} ({size_mb:.0f} MB)")
 
@@ -3155,29 +3490,13 @@ def main():
                     args.clip,
                     args.clip_buffer,
                     True,  # defer_finalization — Phase 2 runs globally below
-                    TILESET_IDS,
                     None,  # n_workers placeholder, filled below
                 )
             )
-        n_outer = min(args.jobs, len(tile_args))
-        n_inner = max(1, args.jobs // n_outer)
-        tile_args = [t[:-1] + (n_inner,) for t in tile_args]
 
         # Phase 1: stream all region features to .jsonl files (no finalization yet)
         _log("Phase 1: Writing features...")
-        if n_outer == 1:
-            write_results = [process_geojson_to_tiles(tile_args[0])]
-        else:
-            with Pool(n_outer) as pool:
-                write_results = list(
-                    tqdm(
-                        pool.imap_unordered(process_geojson_to_tiles, tile_args),
-                        total=len(tile_args),
-                        desc="Writing regions",
-                        unit="region",
-                        disable=not is_interactive(),
-                    )
-                )
+        write_results = _write_regions(tile_args, args.jobs)
 
         all_tile_files_written = {}  # (ts, x, y) -> (jsonl_path, json_path)
         for r in write_results:
@@ -3200,32 +3519,19 @@ def main():
             (jsonl, json_, None, None)
             for jsonl, json_ in all_tile_files_written.values()
         ]
-        total_finalize_bytes = 0
-        n_workers = min(args.jobs, max(len(finalize_args), 1))
-        with Pool(n_workers, initializer=init_land_polygons, initargs=(_DATA_DIR, expanded_merged_bounds)) as pool:
-            byte_counts = list(
-                tqdm(
-                    pool.imap_unordered(_finalize_tile_worker, finalize_args),
-                    total=len(finalize_args),
-                    desc="Finalizing tiles",
-                    unit="tile",
-                    disable=not is_interactive(),
-                )
-            )
-        total_finalize_bytes = sum(b for b in byte_counts if b)
+        total_finalize_bytes = _finalize_tiles(finalize_args, args.jobs, expanded_merged_bounds)
 
         # Wrap write_results for the summary loop below, adding finalization bytes
         for r in write_results:
             r["total_bytes"] = total_finalize_bytes // max(len(write_results), 1)
         all_results.extend(write_results)
 
-    # Merge bounds from all results
-    merged_bounds = {
-        "minLon": float("inf"),
-        "maxLon": float("-inf"),
-        "minLat": float("inf"),
-        "maxLat": float("-inf"),
-    }
+    # Merge bounds from all results. Land polygon bounds are left out - they're
+    # filtered to OSM bounds anyway and before filtering they cover the entire world
+    merged_bounds = merge_bounds([
+        r["bounds"] for r in all_results
+        if r["status"] == "success" and r["bounds"] and "land-polygon" not in r["name"]
+    ])
 
     _log("Processing Summary:")
 
@@ -3234,15 +3540,6 @@ def main():
 
     for result in all_results:
         if result["status"] == "success":
-            bounds = result["bounds"]
-            # Don't include land polygon bounds in final merge - they're filtered to OSM bounds anyway
-            # and before filtering they cover the entire world
-            if bounds and "land-polygon" not in result["name"]:
-                merged_bounds["minLon"] = min(merged_bounds["minLon"], bounds["minLon"])
-                merged_bounds["maxLon"] = max(merged_bounds["maxLon"], bounds["maxLon"])
-                merged_bounds["minLat"] = min(merged_bounds["minLat"], bounds["minLat"])
-                merged_bounds["maxLat"] = max(merged_bounds["maxLat"], bounds["maxLat"])
-
             # Clean up names for display
             name = result["name"].replace(".geojson", "").replace("-latest.osm", "")
             tile_bytes = result.get("total_bytes", 0)
@@ -3265,12 +3562,11 @@ def main():
     # Write tile index
     if success_count > 0:
         tile_count = sum(
-            len(list((temp_tile_dir / tileset_id).rglob("*.json.gz")))
-            for tileset_id in TILESET_IDS
+            _count_tile_files(temp_tile_dir / tileset_id) for tileset_id in TILESET_IDS
         )
 
         # Check if we have valid merged bounds
-        if merged_bounds["minLon"] == float("inf"):
+        if finite_bounds(merged_bounds) is None:
             print()
             print("⚠ WARNING: No valid bounds in merged results!")
             print("  All processed sources returned no bounds data.")
@@ -3308,8 +3604,8 @@ def main():
             "generated": int(time.time() * 1000),
         }
 
-        with open(index_file, "w", encoding="utf-8") as f:
-            json.dump(index_data, f, indent=2)
+        with open(index_file, "wb") as f:
+            f.write(orjson.dumps(index_data, option=orjson.OPT_INDENT_2))
 
         # Calculate total tile size
         grand_total_bytes = sum(
@@ -3332,7 +3628,7 @@ def main():
         print()
         print("Computing tile statistics...")
         stats_start = time.time()
-        compute_tile_statistics(temp_tile_dir)
+        compute_tile_statistics(temp_tile_dir, jobs=args.jobs)
         print(f"  Done in {time.time() - stats_start:.1f}s")
 
         # Move tiles from temp directory to final location atomically
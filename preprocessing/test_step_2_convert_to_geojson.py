@@ -0,0 +1,32 @@
+from step_2_convert_to_geojson import pbf_fingerprint
+
+
+def _fingerprint_after_edit(tmp_path, size, offset):
+    pbf = tmp_path / "region-latest.osm.pbf"
+    data = bytearray(i % 251 for i in range(size))
+    pbf.write_bytes(data)
+    before = pbf_fingerprint(pbf, size)
+    data[offset] ^= 0xFF
+    pbf.write_bytes(data)
+    return before, pbf_fingerprint(pbf, size)
+
+
+def test_fingerprint_covers_tail_of_file_between_one_and_two_samples(tmp_path):
+    size = 100 * 1024
+    before, after = _fingerprint_after_edit(tmp_path, size, size - 10)
+    assert before != after
+
+
+def test_fingerprint_covers_tail_of_large_file(tmp_path):
+    size = 512 * 1024
+    before, after = _fingerprint_after_edit(tmp_path, size, size - 10)
+    assert before != after
+
+
+def test_fingerprint_stable_for_identical_content(tmp_path):
+    size = 100 * 1024
+    a = tmp_path / "a.osm.pbf"
+    b = tmp_path / "b.osm.pbf"
+    a.write_bytes(bytes(i % 251 for i in range(size)))
+    b.write_bytes(a.read_bytes())
+    assert pbf_fingerprint(a, size) == pbf_fingerprint(b, size)
@@ -309,6 +309,30 @@ const POI_AMENITY_PRIORITY = [
   "services",
 ];
 
+// Tag value -> category lookups for classifyPOI, built once from POI_CATEGORIES.
+// Insertion order encodes precedence: the first category claiming a value wins.
+function buildPoiTagIndex(tag, catIds) {
+  const index = new Map();
+  for (const catId of catIds) {
+    const values = POI_CATEGORIES[catId][tag];
+    if (!values) continue;
+    for (const value of values) {
+      if (!index.has(value)) index.set(value, catId);
+    }
+  }
+  return index;
+}
+
+const POI_AMENITY_INDEX = buildPoiTagIndex("amenity", [
+  ...POI_AMENITY_PRIORITY,
+  "shopping",
+]);
+const POI_SHOP_INDEX = buildPoiTagIndex("shop", Object.keys(POI_CATEGORIES));
+const POI_LEISURE_INDEX = buildPoiTagIndex(
+  "leisure",
+  Object.keys(POI_CATEGORIES),
+);
+
 class MapRenderer {
   constructor() {
     this.canvas = null;
@@ -3251,8 +3275,15 @@ class MapRenderer {
       if (indexResponse.ok) {
         this.tileIndex = await indexResponse.json();
 
-        // Use bounds from index.json
-        if (this.tileIndex.bounds) {
+        // Use bounds from index.json (absent, or edges null, when no region had
+        // valid bounds; keep the default Hamburg bounds then)
+        const indexBounds = this.tileIndex.bounds;
+        if (
+          indexBounds &&
+          ["minLon", "maxLon", "minLat", "maxLat"].every((k) =>
+            Number.isFinite(indexBounds[k]),
+          )
+        ) {
           this.tileBounds = this.tileIndex.bounds;
           console.log("[TILES] Loaded bounds from index:", this.tileBounds);
         }
@@ -4249,37 +4280,23 @@ class MapRenderer {
     const historic = props.historic;
     const leisure = props.leisure;
 
-    // Check amenity tags first (highest priority)
+    // Check amenity tags first (highest priority, POI_AMENITY_PRIORITY order,
+    // then shopping's amenity set)
     if (amenity) {
-      for (const catId of POI_AMENITY_PRIORITY) {
-        const catDef = POI_CATEGORIES[catId];
-        if (catDef.amenity && catDef.amenity.has(amenity)) return catId;
-      }
-      // Also check shopping's amenity set
-      if (POI_CATEGORIES.shopping.amenity.has(amenity)) return "shopping";
+      const catId = POI_AMENITY_INDEX.get(amenity);
+      if (catId) return catId;
     }
     // Check shop tags
     if (shop) {
-      for (const [catId, catDef] of Object.entries(POI_CATEGORIES)) {
-        if (catDef.shop && catDef.shop.has(shop)) return catId;
-      }
-      return "shopping"; // fallback for unrecognized shops
-    }
-    // Check tourism tags
-    if (tourism) {
-      if (POI_CATEGORIES.tourism.tourism.has(tourism)) return "tourism";
-      return "tourism"; // fallback
-    }
-    // Check historic tags
-    if (historic) {
-      if (POI_CATEGORIES.historic.historic.has(historic)) return "historic";
-      return "historic"; // fallback
+      return POI_SHOP_INDEX.get(shop) || "shopping"; // fallback for unrecognized shops
     }
+    // Tourism and historic map to their own category, recognized or not
+    if (tourism) return "tourism";
+    if (historic) return "historic";
     // Check leisure tags
     if (leisure) {
-      for (const [catId, catDef] of Object.entries(POI_CATEGORIES)) {
-        if (catDef.leisure && catDef.leisure.has(leisure)) return catId;
-      }
+      const catId = POI_LEISURE_INDEX.get(leisure);
+      if (catId) return catId;
     }
     // Unmatched amenity -> services
     if (amenity) return "services";